@@ -0,0 +1,43 @@
+"""Memory and construction speed of single cells and rows
+
+Run with ``python benchmarks/cells.py`` from the top of the repository.
+"""
+from __future__ import print_function
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+from tabipy import TableCell, TableRow
+
+N = 100000
+
+def bytes_per(make, n=N):
+    "Average memory allocated for each of n objects returned by make()"
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objs = [make(i) for i in range(n)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # the list holding the objects is not part of their cost
+    return (after - before - sys.getsizeof(objs)) / float(n)
+
+def per_second(stmt, number):
+    "How many times per second stmt runs, best of three"
+    best = min(timeit.repeat(stmt, number=number, repeat=3))
+    return number / best
+
+def main():
+    # integers below 257 are cached, so the values do not count towards the
+    # cost of the cells
+    print('bytes per TableCell:      %8.1f' % bytes_per(lambda i: TableCell(1)))
+    print('bytes per cell in a row:  %8.1f'
+          % (bytes_per(lambda i: TableRow(1, 2, 3, 4, 5), N // 5) / 5))
+    print('TableCell() per second:   %8.0f'
+          % per_second(lambda: TableCell(1), N))
+    print('cells per second in rows: %8.0f'
+          % (5 * per_second(lambda: TableRow(1, 2, 3, 4, 5), N // 5)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+"""Timing and peak memory of building and rendering tables
+
+Run from the top of the repository::
+
+    python benchmarks/suite.py                      # all cases, all sizes
+    python benchmarks/suite.py --sizes 1000,100000  # fewer sizes
+    python benchmarks/suite.py --save baseline.json
+    python benchmarks/suite.py --compare baseline.json
+
+With --compare, the results are checked against a file written by an
+earlier run with --save, and the exit status is 1 if any case got slower or
+used more memory than the threshold allows.
+"""
+from __future__ import print_function, division
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+import warnings
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+from tabipy import Table, TableHeaderRow
+
+SIZES = (1000, 100000, 1000000)
+COLUMNS = 10
+
+def _rows(ncells):
+    nrows = max(ncells // COLUMNS, 1)
+    return [tuple(r * COLUMNS + c + 0.5 for c in range(COLUMNS))
+            for r in range(nrows)]
+
+def _table(ncells):
+    return Table(TableHeaderRow(*('c%d' % c for c in range(COLUMNS))),
+                 *_rows(ncells),
+                 col_format=('{:.1f}',) * COLUMNS)
+
+def _span_table(ncells):
+    """A table like those in tests/test_rowspan.py and test_colspan.py, with
+    spans in every other row"""
+    t = _table(ncells)
+    for r in range(1, len(t.rows) - 1, 2):
+        t.cell(r, 0).row_span = 2
+        t.cell(r, 2).col_span = 2
+        t.cell(r, 5).row_span = 2
+        t.cell(r, 5).col_span = 3
+    return t
+
+# words of a text-heavy table, half of them with characters LaTeX escapes
+WORDS = ('alpha', 'R&D', 'x_1', 'beta gamma', '{set}', '50$', 'plain text',
+         'C:\\dir')
+
+def _text_rows(ncells):
+    nrows = max(ncells // COLUMNS, 1)
+    return [tuple(WORDS[(r * 7 + c) % len(WORDS)] + str(r % 50)
+                  for c in range(COLUMNS)) for r in range(nrows)]
+
+def _text_table(ncells):
+    return Table(TableHeaderRow(*('c%d' % c for c in range(COLUMNS))),
+                 *_text_rows(ncells))
+
+def _text_columns(ncells):
+    return Table.from_columns(list(zip(*_text_rows(ncells))),
+                              header=['c%d' % c for c in range(COLUMNS)])
+
+# Each case is (name, setup, run): setup(ncells) makes what run times.
+
+def _from_tuples(ncells):
+    rows = _rows(ncells)
+    return lambda: Table(*rows)
+
+def _from_dict(ncells):
+    columns = list(zip(*_rows(ncells)))
+    data = dict(('c%d' % c, list(col)) for c, col in enumerate(columns))
+    return lambda: Table(data)
+
+def _column_count(ncells):
+    rows = _table(ncells).rows
+    return lambda: [row.column_count() for row in rows]
+
+def _render(make_table, method):
+    def setup(ncells):
+        t = make_table(ncells)
+        def run():
+            # drop the rows cached by the previous render
+            for row in t.rows:
+                row._changed()
+            return getattr(t, method)()
+        return run
+    return setup
+
+CASES = [
+    ('Table from tuples', _from_tuples),
+    ('Table from dict', _from_dict),
+    ('TableRow.column_count', _column_count),
+    ('_repr_html_', _render(_table, '_repr_html_')),
+    ('_repr_latex_', _render(_table, '_repr_latex_')),
+    ('span-heavy _repr_html_', _render(_span_table, '_repr_html_')),
+    ('span-heavy _repr_latex_', _render(_span_table, '_repr_latex_')),
+    ('text-heavy _repr_latex_', _render(_text_table, '_repr_latex_')),
+    ('text-heavy columnar _repr_latex_',
+     _render(_text_columns, '_repr_latex_')),
+]
+
+def measure(setup, ncells):
+    "Best time of a few runs and peak memory of one, in seconds and bytes"
+    run = setup(ncells)
+    first = timeit.timeit(run, number=1)
+    if first > 1:
+        seconds = first
+    else:
+        # quick cases are run often enough to take a tenth of a second
+        number = max(1, int(0.1 / max(first, 1e-6)))
+        seconds = min(timeit.repeat(run, number=number, repeat=5)) / number
+    peak = None
+    if tracemalloc is not None:
+        tracemalloc.start()
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return seconds, peak
+
+def run_cases(sizes, only=None):
+    results = {}
+    for name, setup in CASES:
+        if only and only not in name:
+            continue
+        for ncells in sizes:
+            seconds, peak = measure(setup, ncells)
+            key = '%s [%d cells]' % (name, ncells)
+            results[key] = {'seconds': seconds, 'peak_bytes': peak}
+            print('%-45s %9.4f s %s' % (key, seconds,
+                  '' if peak is None else '%10.1f MB' % (peak / 1e6)))
+            sys.stdout.flush()
+    return results
+
+def compare(results, baseline, threshold):
+    "Print changes against the baseline; return the names that regressed"
+    regressed = []
+    print()
+    print('%-45s %9s %9s' % ('compared to baseline', 'time', 'memory'))
+    for key, result in sorted(results.items()):
+        if key not in baseline:
+            continue
+        old = baseline[key]
+        ratios = []
+        for field in ('seconds', 'peak_bytes'):
+            if result[field] is None or not old.get(field):
+                ratios.append(None)
+            else:
+                ratios.append(result[field] / old[field])
+        print('%-45s %9s %9s' % ((key,) + tuple('' if r is None else
+                                               '%.2fx' % r for r in ratios)))
+        if any(r is not None and r > threshold for r in ratios):
+            regressed.append(key)
+    return regressed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default=','.join(map(str, SIZES)),
+                        help='comma separated numbers of cells')
+    parser.add_argument('--case', help='only run cases containing this text')
+    parser.add_argument('--save', metavar='FILE',
+                        help='write the results to FILE as JSON')
+    parser.add_argument('--compare', metavar='FILE',
+                        help='compare with results saved in FILE')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='largest allowed ratio to the baseline '
+                             '(default 1.25)')
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    # \multirow warnings would be printed for every spanning cell
+    warnings.simplefilter('ignore')
+    results = run_cases(sizes, args.case)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'python': platform.python_version(),
+                       'results': results}, f, indent=1, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        regressed = compare(results, baseline, args.threshold)
+        if regressed:
+            print('\nslower or larger than the baseline allows:')
+            for key in regressed:
+                print('  ' + key)
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
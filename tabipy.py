@@ -1,17 +1,362 @@
+import csv
+import io
+import json
+import numbers
 import re
 import sys
+import threading
+import uuid
 import warnings
-from collections import OrderedDict as Dict
+import zlib
+from array import array
+from contextlib import contextmanager
+from decimal import Decimal
+from functools import wraps
+from itertools import chain, compress
+from operator import attrgetter, eq, ne, or_
+from timeit import default_timer
+from weakref import WeakSet
 PY3 = sys.version_info[0] >= 3
+builtin_format = format
 
 try:
     from itertools import zip_longest  # Python 3
 except ImportError:
     from itertools import izip_longest as zip_longest  # Python 2
-from collections import Mapping
+try:
+    from collections.abc import Mapping, Sequence  # Python 3.3+
+except ImportError:
+    from collections import Mapping, Sequence  # Python 2
+
+# format applied to cells without any format
+_default_format = u'{}'.format
+
+# a format string made of a single replacement field, e.g. '{:.4g}'
+_single_field_re = re.compile(r'\{0?:([^{}]*)\}$')
+
+_formatters = {}
+
+def _compile_format(format):
+    """A function applying the format string format to a value
+
+    Each format string is compiled once.  A format made of a single
+    replacement field, such as '{:.4g}', is applied with ``format()``, which
+    skips parsing the format string for every value."""
+    try:
+        return _formatters[format]
+    except KeyError:
+        pass
+    if not format or format == '{}':
+        formatter = _default_format
+    else:
+        match = _single_field_re.match(format)
+        if match:
+            spec = match.group(1)
+            formatter = lambda value: builtin_format(value, spec)
+        else:
+            formatter = format.format
+    _formatters[format] = formatter
+    return formatter
+
+# most distinct values remembered by a memoized formatter
+_memo_size = 10000
+
+def _memoize(formatter):
+    """Remember the formatted text of the values formatter is applied to
+
+    This pays off for columns that repeat a small set of values.  Numbers
+    that may be equal but formatted differently, such as 0.0 and -0.0 or
+    Decimal('1.0') and Decimal('1.00'), are formatted every time."""
+    memo = {}
+    inexact = (float, complex, Decimal)
+    np = sys.modules.get('numpy')
+    if np is not None:
+        inexact += (np.inexact,)
+    def formatter_memo(value):
+        if isinstance(value, inexact):
+            return formatter(value)
+        # 1, 1.0 and True are equal but are not formatted the same
+        key = (type(value), value)
+        try:
+            return memo[key]
+        except KeyError:
+            text = memo[key] = formatter(value)
+            if len(memo) > _memo_size:
+                memo.clear()
+            return text
+        except TypeError:
+            # unhashable value
+            return formatter(value)
+    return formatter_memo
+
+def _html_escape(text):
+    "Escape the characters of text that HTML gives a meaning to"
+    if '&' in text or '<' in text or '>' in text:
+        return text.replace('&', '&amp;').replace('<', '&lt;').replace(
+            '>', '&gt;')
+    return text
+
+def _html_escape_values(values):
+    """Escape a list of text for HTML in one go, for a whole column
+
+    This is _html_escape on the joined values, as in _latex_escape_values."""
+    text = u'\x00'.join(values)
+    escaped = _html_escape(text)
+    if escaped is text:
+        return values
+    if text.count(u'\x00') != len(values) - 1:
+        # the separator occurs in the values themselves
+        return [_html_escape(value) for value in values]
+    return escaped.split(u'\x00')
+
+def _one_line(text):
+    "text with its line breaks made spaces, for plain text and Markdown"
+    if '\n' in text or '\r' in text:
+        return ' '.join(text.splitlines())
+    return text
+
+def _text_line(texts, widths, sep):
+    """A row of plain text or Markdown from (text, number of columns) for
+    each of its cells, each padded to the width of its columns"""
+    parts = []
+    col = 0
+    for text, span in texts:
+        width = sum(widths[col:col+span]) + len(sep) * (span - 1)
+        parts.append(text.ljust(width))
+        col += span
+    return sep.join(parts)
+
+# opening and closing tags of cells by their look; see TableCell._html
+_html_tags = {}
+
+def _html_tag(header, row_span, col_span, style, classes):
+    """The opening and closing tags of a cell
+
+    style is the Style of the cell or None, given as a class if classes is
+    True and inline otherwise."""
+    tag = 'th' if header else 'td'
+    spans = ''
+    if col_span>1:
+        spans += 'colspan="%s" '%col_span
+    if row_span>1:
+        spans += 'rowspan="%s"'%row_span
+    attrs = []
+    if style is not None:
+        if classes:
+            attrs.append('class="%s"'%style.name)
+        elif style.css:
+            attrs.append('style="%s"'%style.css)
+    return "<%s %s %s>" % (tag, spans, ' '.join(attrs)), "</%s>" % tag
+
+def _cell_tags(header, row_span, col_span, style, styles):
+    """The opening and closing tags of a cell, made once for each look of
+    a cell
+
+    If styles is given, style is given as a class and added to styles, a
+    set; otherwise it is given inline."""
+    classes = styles is not None
+    if classes and style is not None:
+        styles.add(style)
+    key = (header, row_span, col_span, style, classes)
+    try:
+        return _html_tags[key]
+    except KeyError:
+        tags = _html_tags[key] = _html_tag(header, row_span, col_span, style,
+                                           classes)
+        if len(_html_tags) > _memo_size:
+            _html_tags.clear()
+        return tags
+
+# text escaped for LaTeX that needed escaping; see _latex_escape
+_latex_escaped = {}
+
+def _latex_escape(text):
+    """Escape text for LaTeX
+
+    Most text has no characters special to LaTeX, which a look at its
+    characters shows and which is returned as it is.  Other text is escaped
+    with the regex and remembered, for values that come up again."""
+    if TableCell._latex_escape_re is None:
+        TableCell._compile_latex_escape()
+    if TableCell._latex_special.isdisjoint(text):
+        return text
+    try:
+        return _latex_escaped[text]
+    except KeyError:
+        escaped = _latex_escaped[text] = TableCell._latex_escape_re.sub(
+            TableCell._latex_escape_func, text)
+        if len(_latex_escaped) > _memo_size:
+            _latex_escaped.clear()
+        return escaped
+
+def _latex_escape_values(values):
+    """Escape a list of text for LaTeX in one go, for a whole column
+
+    The values are joined so that a column without special characters is
+    passed after a single check, and one with them is escaped with a single
+    run of the regex."""
+    if TableCell._latex_escape_re is None:
+        TableCell._compile_latex_escape()
+    text = u'\x00'.join(values)
+    if TableCell._latex_special.isdisjoint(text):
+        return values
+    if text.count(u'\x00') != len(values) - 1:
+        # the separator occurs in the values themselves
+        return [_latex_escape(value) for value in values]
+    return TableCell._latex_escape_re.sub(TableCell._latex_escape_func,
+                                          text).split(u'\x00')
+
+def _style_html(styles):
+    "A <style> element defining the CSS classes of styles"
+    rules = sorted('.%s {%s}' % (style.name, style.css) for style in styles)
+    return '<style>\n' + '\n'.join(rules) + '\n</style>'
+
+class Style(object):
+    """The colours of a cell, shared by all cells that look the same
+
+    Styles are interned: Style() with the same colours gives the same object,
+    so a style must not be changed once made.  Each style used in the HTML of
+    a table becomes a CSS class, defined once in a <style> element after the
+    table, rather than a style attribute on every cell."""
+    __slots__ = ('bg_colour', 'text_colour', 'css', 'name')
+    _interned = {}
+
+    def __new__(cls, bg_colour=None, text_colour=None):
+        key = (bg_colour, text_colour)
+        style = cls._interned.get(key)
+        if style is None:
+            style = object.__new__(cls)
+            style.bg_colour = bg_colour
+            style.text_colour = text_colour
+            rules = []
+            if bg_colour:
+                rules.append('background-color:%s' % bg_colour)
+            if text_colour:
+                rules.append('color:%s' % text_colour)
+            style.css = '; '.join(rules)
+            # named after the rules so that the name is the same everywhere
+            style.name = 'tabipy-%08x' % (
+                zlib.crc32(style.css.encode('utf-8')) & 0xffffffff)
+            cls._interned[key] = style
+        return style
+
+    def __reduce__(self):
+        return (Style, (self.bg_colour, self.text_colour))
+
+    def __repr__(self):
+        return 'Style(bg_colour=%r, text_colour=%r)' % (self.bg_colour,
+                                                       self.text_colour)
+
+def _numpy():
+    "NumPy, or None if it is not installed"
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+def _matches(where, values):
+    """Evaluate where, a function or a sequence of booleans, for a column of
+    values; return a sequence of booleans as long as values
+
+    With NumPy, and a column of booleans or numbers, the function is called
+    once with the whole column as an array.  If that does not give an array
+    of booleans, as for functions that only work on single values, or the
+    column holds other values, it is called for each value instead."""
+    if not callable(where):
+        if len(where) != len(values):
+            raise ValueError('Wrong number of values in the mask')
+        return where
+    np = _numpy()
+    array = np.asarray(values) if np is not None else None
+    # a column of mixed values turns into strings, which compare differently
+    if array is not None and array.dtype.kind in 'biuf':
+        try:
+            result = np.asarray(where(array))
+        except Exception:
+            result = None
+        if result is not None and result.shape == (len(values),):
+            return result.astype(bool)
+    return [bool(where(value)) for value in values]
+
+def _numbers(values):
+    """The values of a column as floats, with nan for those that are not
+    numbers; a NumPy array if NumPy is installed"""
+    np = _numpy()
+    if np is not None:
+        array = np.asarray(values)
+        if array.dtype.kind in 'biuf':
+            return array.astype(float)
+    numbers = []
+    for value in values:
+        try:
+            numbers.append(float(value))
+        except (TypeError, ValueError):
+            numbers.append(float('nan'))
+    return np.array(numbers) if np is not None else numbers
+
+def _number_range(numbers):
+    "The smallest and largest of numbers, ignoring nan, or None if all are"
+    np = _numpy()
+    if np is not None:
+        numbers = numbers[~np.isnan(numbers)]
+        if len(numbers) == 0:
+            return None
+        return float(numbers.min()), float(numbers.max())
+    numbers = [x for x in numbers if x == x]
+    return (min(numbers), max(numbers)) if numbers else None
+
+def _colour_steps(low, high, steps):
+    "steps colours from low to high, both '#rrggbb' or '#rgb'"
+    def rgb(colour):
+        digits = colour.lstrip('#')
+        if len(digits) == 3:
+            digits = ''.join(d * 2 for d in digits)
+        if not colour.startswith('#') or len(digits) != 6:
+            raise ValueError('Expected a colour as #rrggbb: %r' % colour)
+        return [int(digits[i:i+2], 16) for i in (0, 2, 4)]
+    low, high = rgb(low), rgb(high)
+    colours = []
+    for step in range(steps):
+        t = step / float(steps - 1) if steps > 1 else 0.0
+        colours.append('#%02x%02x%02x' % tuple(
+            int(round(a + (b - a) * t)) for a, b in zip(low, high)))
+    return colours
+
+def _make_style(bg_colour, text_colour):
+    "The style with the given colours, or None for no colours"
+    if bg_colour is None and text_colour is None:
+        return None
+    return Style(bg_colour, text_colour)
+
+def _unpickle_cell(cls, value, header, row_span, col_span, format, style):
+    "Recreate a pickled cell; see TableCell.__reduce__"
+    cell = cls.__new__(cls)
+    TableCell.__init__(cell, value, header, row_span=row_span,
+                       col_span=col_span, format=format, style=style)
+    return cell
+
+def _unpickle_row(cls, cells, max_len, row_format):
+    "Recreate a pickled row; see TableRow.__reduce__"
+    row = cls.__new__(cls)
+    TableRow.__init__(row, format=row_format)
+    for c in cells:
+        row._add_cell(c)
+    row.max_len = max_len
+    return row
+
+def _cell_attribute(name):
+    """A cell attribute whose changes make the row holding the cell render
+    again"""
+    slot = '_' + name
+    def fset(self, value):
+        setattr(self, slot, value)
+        self._changed()
+    return property(attrgetter(slot), fset)
 
 class TableCell(object):
-    bg_colour = None
+    __slots__ = ('_row', '_value', '_header', '_style', '_row_span',
+                 '_col_span', '_format', '_suppress')
     _latex_escape_table = {'&': r'\&',
                            '\\': r'{\textbackslash}',
                            '~': r'{\textasciitilde}',
@@ -23,57 +368,83 @@ class TableCell(object):
                            '{': '\{',
                            '}': '\}'}
     _latex_escape_re = None
+    # the characters starting the keys of _latex_escape_table
+    _latex_special = None
     
     def __init__(self, value, header=False, bg_colour=None, text_colour=None,
-                 row_span=1, col_span=1, format=None):
-        self.value = value
-        self.header = header
-        self.bg_colour = bg_colour
-        self.text_colour = text_colour
-        self.row_span = row_span
-        self.col_span = col_span
-        self.format = format
+                 row_span=1, col_span=1, format=None, style=None):
+        self._row = None
+        self._value = value
+        self._header = header
+        # the colours are kept as a Style shared with other cells
+        self._style = (style if bg_colour is None and text_colour is None
+                       else _make_style(bg_colour, text_colour))
+        self._row_span = self._check_span(row_span)
+        self._col_span = self._check_span(col_span)
+        self._format = format
         self._suppress = False
 
-        # initialize regex for escaping to latex code
-        if self._latex_escape_re is None:
-            self._latex_escape_re = re.compile('|'.join(map(re.escape, 
-                                        sorted(self._latex_escape_table.keys(),
-                                               key=len, reverse=True))))
-    def _defaults_(self):
-        defaults = Dict([('value',('','self.value')),
-                         ('header',(False,'self.header')),
-                         ('bg_colour',(None,'self.bg_colour')),
-                         ('text_colour',(None,'self.text_colour')),
-                         ('row_span',(1,'self.row_span')),
-                         ('col_span',(1,'self.col_span')),
-                         ('format',(None,'self.format'))])
-        return defaults
+    def __reduce__(self):
+        # the row holding the cell links it again when it is unpickled
+        return (_unpickle_cell, (type(self), self._value, self._header,
+                                 self._row_span, self._col_span,
+                                 self._format, self._style))
+
+    value = _cell_attribute('value')
+    header = _cell_attribute('header')
+    format = _cell_attribute('format')
+    style = _cell_attribute('style')
+
+    @property
+    def bg_colour(self):
+        return self._style.bg_colour if self._style is not None else None
+    @bg_colour.setter
+    def bg_colour(self, val):
+        self.style = _make_style(val, self.text_colour)
+
+    @property
+    def text_colour(self):
+        return self._style.text_colour if self._style is not None else None
+    @text_colour.setter
+    def text_colour(self, val):
+        self.style = _make_style(self.bg_colour, val)
+
+    @classmethod
+    def _compile_latex_escape(cls):
+        """Build the regex for escaping to latex code
+
+        This is done on first use and kept on TableCell for all cells."""
+        TableCell._latex_special = frozenset(key[0] for key in
+                                             cls._latex_escape_table)
+        TableCell._latex_escape_re = re.compile('|'.join(map(re.escape,
+                                    sorted(cls._latex_escape_table.keys(),
+                                           key=len, reverse=True))))
+        return TableCell._latex_escape_re
+    # attributes shown by __repr__ where they differ from these defaults
+    _defaults = (('header', False),
+                 ('bg_colour', None),
+                 ('text_colour', None),
+                 ('row_span', 1),
+                 ('col_span', 1),
+                 ('format', None))
     
-    def _latex_escape_func(self, match): 
+    @staticmethod
+    def _latex_escape_func(match):
         """Replace regex match with latex equivalent"""
-        return self._latex_escape_table[match.group()]
+        return TableCell._latex_escape_table[match.group()]
         
     def __repr__(self):
         val = "'%s'"%self.value if type(self.value)==str else self.value
-        text = "TableCell({}".format(val)
-        for key, values in self._defaults_().items():
-            if key == 'value':
-                continue
-            default, txt_actual = values
-            current = eval(txt_actual)
+        parts = ["TableCell({}".format(val)]
+        for key, default in self._defaults:
+            current = getattr(self, key)
             if default!=current:
-                text += ', {}={}'.format(key,current)
-        text += ')'
-        return text
+                parts.append(', {}={}'.format(key,current))
+        parts.append(')')
+        return ''.join(parts)
     
     def _make_css(self):
-        rules = []
-        if self.bg_colour:
-            rules.append('background-color:%s' % self.bg_colour)
-        if self.text_colour:
-            rules.append('color:%s' % self.text_colour)
-        return '; '.join(rules)
+        return self._style.css if self._style is not None else ''
         
     def _check_span(self,val):
         "Validate the span value."
@@ -90,6 +461,7 @@ class TableCell(object):
     def row_span(self,val):
         val = self._check_span(val)
         self._row_span = val
+        self._span_changed()
         
     @property
     def col_span(self):
@@ -98,57 +470,84 @@ class TableCell(object):
     def col_span(self,val):
         val = self._check_span(val)
         self._col_span = val
+        self._span_changed()
+
+    def _changed(self):
+        "Let the row holding this cell know that the cell changed."
+        if self._row is not None:
+            self._row._changed()
+
+    def _span_changed(self):
+        "Let the row holding this cell know that the cell's spans changed."
+        if self._row is not None:
+            self._row._cell_span_changed()
 
     def formatted_value(self, format=None):
+        return self._formatted(_compile_format(format))
+
+    def _formatted(self, formatter):
+        """The formatted value given the compiled row or column format"""
         if self.format:
-            val = self.format.format(self.value)
+            return _compile_format(self.format)(self.value)
         # do not apply column format to headers
-        elif not self.header and format:
-            val = format.format(self.value)
+        elif not self.header:
+            return formatter(self.value)
         else:
-            val = u'{}'.format(self.value)
-        return val
+            return _default_format(self.value)
  
     def _repr_html_(self, format=None):
-        tag = 'th' if self.header else 'td'
-        spans = ''
-        if self.col_span>1:
-            spans += 'colspan="%s" '%self.col_span
-        if self.row_span>1:
-            spans += 'rowspan="%s"'%self.row_span
-        attrs = []
-        style = self._make_css()
-        if style:
-            attrs.append('style="%s"'%style)
-
-        return "<%s %s %s>%s</%s>"% (tag, spans,' '.join(attrs), 
-                                     self.formatted_value(format),
-                                     tag) 
+        return self._html(_compile_format(format))
+
+    def _html(self, formatter, row_span=None, col_span=None, styles=None,
+              col_style=None):
+        """Render the cell as HTML
+
+        row_span and col_span, if given, replace those of the cell, for
+        showing a span clipped to part of the table.  If styles is given, the
+        style of the cell is given as a CSS class and added to styles, a set;
+        otherwise it is given inline.  col_style is the style the table gives
+        the cell's column in its row, which the cell's own style overrides."""
+        row_span = self._row_span if row_span is None else row_span
+        col_span = self._col_span if col_span is None else col_span
+        style = self._style if self._style is not None else col_style
+        start, end = _cell_tags(self._header, row_span, col_span, style,
+                                styles)
+        return start + _html_escape(self._formatted(formatter)) + end
 
     def _repr_latex_(self, format=None):
-        out = self._latex_escape_re.sub(self._latex_escape_func, 
-                                        self.formatted_value(format))
+        return self._latex(_compile_format(format))
+
+    def _latex(self, formatter, row_span=None, col_span=None):
+        """Render the cell as LaTeX
+
+        row_span and col_span, if given, replace those of the cell, as for
+        _html."""
+        row_span = self.row_span if row_span is None else row_span
+        col_span = self.col_span if col_span is None else col_span
+        out = _latex_escape(self._formatted(formatter))
         # the bolf flag must only be next to the value of the cell not outside
         # of the multicolumn flag
         if self._suppress: # For hiding cell content when using multicolumn
             out = ''
         elif self.header:
             out = u"\\bf " + out
-        if self.row_span>1:
+        if row_span>1:
             warn_txt = ('Must use multirow package in the .tex file, \n e.g.'
             r' "\usepackage{multirow} % to support multiple rows"')
             warnings.warn(warn_txt)
-            text_row = "\multirow{%d}{*}{%s}"%(self.row_span,out)  
+            text_row = "\multirow{%d}{*}{%s}"%(row_span,out)  
         else:
             text_row = out
-        if self.col_span>1:
-            text = "\multicolumn{%d}{l}{%s}"%(self.col_span, text_row)
+        if col_span>1:
+            text = "\multicolumn{%d}{l}{%s}"%(col_span, text_row)
         else:
             text = text_row    
 #         text = "\multicolumn{%d}{l}{%s}"%(self.col_span, text_row)
         return text
 
 class TableHeader(TableCell):
+    __slots__ = ()
+
     def __init__(self, value, **kwargs):
        # header of a TableHeader is always True
        if 'header' in kwargs:
@@ -156,10 +555,19 @@ class TableHeader(TableCell):
        super(TableHeader, self).__init__(value, header=True, **kwargs)
 
 class TableRow(object):
+    __slots__ = ('parent', 'max_len', 'cells', '_row_format', '_above',
+                 '_html_cache', '_latex_cache', '_width', '_spanning')
+
     def  __init__(self, *cells, **kwargs):
         self.parent = None
         self.max_len = kwargs.get('max_len',None)
         self.cells = []
+        self._above = []
+        # (number of cells, columns covered), kept up to date by _add_cell
+        self._width = (0, 0)
+        # (number of cells, whether any of them spans), likewise
+        self._spanning = (0, False)
+        self._html_cache = self._latex_cache = None
 
         self.row_format = kwargs.get('format', None)
         if self.row_format:
@@ -184,15 +592,23 @@ class TableRow(object):
         span value from the row above.  This also updates the current row's 
         cell's row_span information to reflect any correction based on the 
         previous row."""
+        return self._spans(self._above)
+
+    def _spans(self, above):
+        """Span information for this row given that of the row above
+
+        This is ``_current`` with the row above passed in explicitly, so that
+        the table renderers can carry the span state from one row to the
+        next without storing it on the rows."""
         decp_a = []
-        if len(self._above)>0:
-            for r, c in self._above:
+        if len(above)>0:
+            for r, c in above:
                 decp_a += [(r,c)]
         else:
             decp_a = [(1,1) for c in range(self.column_count())]
         count = 0
         current = []
-        for index, c in enumerate(self.cells):
+        for index, c in enumerate(self._render_cells()):
             if index == count:
                 for col in range(c.col_span):
                     row_above, col_above = decp_a[count]
@@ -202,14 +618,114 @@ class TableRow(object):
                     count +=1
         return current
 
+    def __reduce__(self):
+        # the table and the rendered fragments are left behind
+        return (_unpickle_row, (type(self), self.cells, self.max_len,
+                                self.row_format))
+
+    @property
+    def row_format(self):
+        return self._row_format
+    @row_format.setter
+    def row_format(self, val):
+        self._row_format = val
+        self._changed()
+
+    def _render_cells(self):
+        "The cells of the row as used for rendering"
+        return self.cells
+
+    def _is_plain(self):
+        """True if none of the cells of the row spans, which is kept as cells
+        are appended; the table renderers then keep no span information for
+        the row."""
+        spanning = self._spanning
+        if spanning is None or spanning[0] != len(self.cells):
+            spanning = self._spanning = (len(self.cells), any(
+                c.row_span != 1 or c.col_span != 1 for c in self.cells))
+        return not spanning[1]
+
     def set_parent(self, parent):
         self.parent = parent
+
+    def _changed(self):
+        """Drop the rendered row after a change to it or its cells, and let
+        the live displays of the table know."""
+        self._html_cache = self._latex_cache = None
+        parent = self.parent
+        if parent is not None and (parent._live or parent._dependents):
+            parent._note_change(self._key())
+
+    def _key(self):
+        "What the live displays of the table know the row by; see Table.live"
+        return self
+
+    def _span_changed(self):
+        "Invalidate the span layout of the table holding this row."
+        self._changed()
+        if self.parent is not None:
+            self.parent._invalidate()
+
+    def _cell_span_changed(self):
+        "Forget the width and spans of the row as well as the span layout."
+        self._width = self._spanning = None
+        self._span_changed()
+
+    def _render_html(self, above, cur, formatters, styles, col_styles=None,
+                     keep=False):
+        """_html with the styles of the cells given as classes, reusing the
+        last result kept while nothing it depends on changed
+
+        The fragment is only kept if keep is True, for renders that return
+        the whole table anyway, so that streaming a table does not leave it
+        in memory.  It is kept with the span information of the row above,
+        the column formats and column styles it was rendered with and the
+        styles it uses, which are added to styles.  Changes to the row and to
+        its cells through their attributes drop it; replacing items of
+        ``cells`` directly does not."""
+        cache = self._html_cache
+        if (cache is not None and cache[0] is formatters and
+                cache[1] == above and cache[4] == col_styles):
+            styles.update(cache[3])
+            return cache[2]
+        if not keep:
+            return self._html(above, cur, formatters, styles, col_styles)
+        used = set()
+        html = self._html(above, cur, formatters, used, col_styles)
+        self._html_cache = (formatters, above, html, used, col_styles)
+        styles.update(used)
+        return html
+
+    def _render_latex(self, above, cur, formatters, keep=False):
+        "_latex, reusing the last result kept like _render_html"
+        cache = self._latex_cache
+        if cache is not None and cache[0] is formatters and cache[1] == above:
+            return cache[2]
+        latex = self._latex(above, cur, formatters)
+        if keep:
+            self._latex_cache = (formatters, above, latex)
+        return latex
+
+    def _add_cell(self, c):
+        c._row = self
+        width = self._width
+        if width is not None and width[0] == len(self.cells):
+            ncells, count = width
+            # as in _count_columns, only a cell that starts a column counts
+            if ncells == count:
+                count += c.col_span
+            self._width = (ncells + 1, count)
+        spanning = self._spanning
+        if spanning is not None and spanning[0] == len(self.cells):
+            self._spanning = (spanning[0] + 1, spanning[1] or
+                              c.row_span != 1 or c.col_span != 1)
+        self.cells.append(c)
             
     def append_cell(self, c):
         if not isinstance(c, TableCell):
             c = TableCell(c)
         if c.col_span>1:
-            self.cells.append(c)
+            self._add_cell(c)
             index = self.column_count()
             blanks = c.col_span -1
             if self.max_len is not None:
@@ -219,13 +735,33 @@ class TableRow(object):
             else:
                 count = blanks
             for blank in range(count):
-                self.cells.append(TableCell(''))
+                self._add_cell(TableCell(''))
         else:
-            self.cells.append(c)
+            self._add_cell(c)
+        self._span_changed()
 
     def column_count(self, debug=False):
+        """The number of columns the row covers
+
+        The count is kept as cells are appended, so this does not look at
+        the cells unless their spans changed or debug is set."""
+        width = self._width
+        if not debug and width is not None and width[0] == len(self.cells):
+            return width[1]
+        count = self._count_columns(debug)
+        self._width = (len(self.cells), count)
+        return count
+
+    def __repr__(self):
+        # the cells are left out, as there may be many
+        cells = len(self.cells)
+        return '<%s: %d cell%s, %d column%s>' % (
+            type(self).__name__.lstrip('_'), cells, 's' if cells != 1 else '',
+            self.column_count(), 's' if self.column_count() != 1 else '')
+
+    def _count_columns(self, debug=False):
         count = 0
-        for index, c in enumerate(self.cells):
+        for index, c in enumerate(self._render_cells()):
             if debug:
                 print('index = {}, value = "{}", col_span = {}'.format(index,
                                                                      c.value,
@@ -235,60 +771,95 @@ class TableRow(object):
         return count
     
     def _repr_html_(self):
+        return self._html(self._above, self._current,
+                          self.parent._formatters() if self.parent else None)
+
+    def _cell_formatters(self, formatters):
+        """The compiled format for each column of the row
+
+        formatters are the compiled column formats of the table, or None if it
+        has none."""
+        # format priority:
+        # 1. cell format (applied by the cell)
+        # 2. row format
+        # 3. table header row format
+        if self.row_format:
+            return [_compile_format(f) for f in self.row_format]
+        return formatters
+
+    def _html(self, above, cur, formatters=None, styles=None, col_styles=None):
+        """Render the row as HTML given the span state above and of this row
+
+        formatters are the compiled column formats of the table.  styles is
+        passed on to TableCell._html, as is the item of col_styles, if given,
+        for the column of each cell."""
         # Note: Because of how a row is rendered, if a cell to the right of a
         # cell, with col_span greater than 1, contains content, that content 
         # will not be rendeded.  The content is not distroyed, just not rended.
-        cur = self._current # Updates the current cells row span info
-        abv = [[1,1] for c in cur] if len(self._above)==0 else self._above
-        html = '<tr>'
+        cells = self._render_cells()
+        formatters = self._cell_formatters(formatters)
+        if cur is None:
+            # a plain row, for which the table keeps no span information:
+            # each cell is in a column of its own
+            parts = ['<tr>']
+            for index, cell in enumerate(cells):
+                formatter = (formatters[index] if formatters
+                             else _default_format)
+                col_style = col_styles[index] if col_styles else None
+                parts.append(cell._html(formatter, None, None, styles,
+                                        col_style))
+            parts.append('</tr>')
+            return ''.join(parts)
+        abv = [[1,1] for c in cur] if len(above)==0 else above
+        parts = ['<tr>']
         index = 0      
         for count, values in enumerate(zip(abv,cur)):
             (a_row, a_col), (c_row, c_col) = values
             if index == count:
                 if a_row==1:
-                    cell_format = None
-                    # format priority:
-                    # 1. cell format
-                    # 2. row format
-                    # 3. table header row format
-                    if self.row_format:
-                        cell_format = self.row_format[index]
-                    elif self.parent.col_format:
-                        cell_format = self.parent.col_format[index]
-    
-                    html += self.cells[index]._repr_html_(cell_format)
+                    formatter = (formatters[index] if formatters
+                                 else _default_format)
+                    col_style = col_styles[index] if col_styles else None
+                    parts.append(cells[index]._html(formatter, None, None,
+                                                    styles, col_style))
                     index += c_col
                 else:
                     index += a_col
-        html +='</tr>'
-        return html
+        parts.append('</tr>')
+        return ''.join(parts)
 
     def _repr_latex_(self):
+        return self._latex(self._above, self._current,
+                           self.parent._formatters() if self.parent else None)
+
+    def _latex(self, above, cur, formatters=None):
+        """Render the row as LaTeX given the span state above and of this row
+
+        formatters are the compiled column formats of the table."""
         # Note: Because of how a row is rendered, if a cell to the right of a
         # cell, with col_span greater than 1, contains content, that content 
         # will not be rendeded.  The content is not distroyed, just not rended.
-        cur = self._current # Updates the current cells row span info
-        abv = [[1,1] for c in cur] if len(self._above)==0 else self._above
-        latex = ''
+        cells = self._render_cells()
+        formatters = self._cell_formatters(formatters)
+        if cur is None:
+            return ' & '.join(
+                cell._latex(formatters[index] if formatters
+                            else _default_format)
+                for index, cell in enumerate(cells)) + '\\\\'
+        abv = [[1,1] for c in cur] if len(above)==0 else above
+        parts = []
         index = 0
         for count, values in enumerate(zip(abv,cur)):
             (a_row, a_col), (c_row, c_col) = values
             if index == count:
-                cell_format = None
-                # format priority:
-                # 1. cell format
-                # 2. row format
-                # 3. table header row format
-                if self.row_format:
-                    cell_format = self.row_format[index]
-                elif self.parent.col_format:
-                    cell_format = self.parent.col_format[index]
+                formatter = (formatters[index] if formatters
+                             else _default_format)
 
                 if index != 0:
-                    latex += ' & '
-                cell = self.cells[index]
+                    parts.append(' & ')
+                cell = cells[index]
                 if a_row==1:
-                    latex += cell._repr_latex_(cell_format)
+                    parts.append(cell._latex(formatter))
                     index += c_col
                 else:
                     # For cells not being rendered, their status need to be  
@@ -296,30 +867,736 @@ class TableRow(object):
                     # previous row's column span.
                     cell._suppress = True
                     tmp, cell._col_span = cell._col_span, a_col
-                    latex += cell._repr_latex_(cell_format)
+                    parts.append(cell._latex(formatter))
                     cell._col_span = tmp
                     cell._suppress = False
                     index += a_col
-        latex += '\\\\'#\n'
-        return latex
+        parts.append('\\\\')#\n'
+        return ''.join(parts)
+
+    def _texts(self, above, cur, formatters=None):
+        """The formatted values of the row, as (text, number of columns,
+        number of rows) for each cell shown and ('', number of columns, 0)
+        for each cell from a row above reaching into the row, in the order
+        of TableRow._html"""
+        cells = self._render_cells()
+        formatters = self._cell_formatters(formatters)
+        if cur is None:
+            return [(cell._formatted(formatters[index] if formatters
+                                     else _default_format), 1, 1)
+                    for index, cell in enumerate(cells)]
+        abv = [[1,1] for c in cur] if len(above)==0 else above
+        texts = []
+        index = 0
+        for count, values in enumerate(zip(abv,cur)):
+            (a_row, a_col), (c_row, c_col) = values
+            if index == count:
+                if a_row==1:
+                    formatter = (formatters[index] if formatters
+                                 else _default_format)
+                    texts.append((cells[index]._formatted(formatter), c_col,
+                                  c_row))
+                    index += c_col
+                else:
+                    texts.append(('', a_col, 0))
+                    index += a_col
+        return texts
 
 class TableHeaderRow(TableRow):
+    __slots__ = ()
+
     def append_cell(self, c, format='{}'):
         if not isinstance(c, TableCell):
             c = TableCell(c, header=True, format=format)
-        self.cells.append(c)
+        self._add_cell(c)
+        self._span_changed()
 
     def set_parent(self, parent):
         super(TableHeaderRow, self).set_parent(parent)
         self.parent.has_header = True
 
+    def _latex(self, above, cur, formatters=None):
+        return (super(TableHeaderRow, self)._latex(above, cur, formatters)
+                + '\\\nhline')
+
+class _ColumnarRow(TableRow):
+    """A row of a table that stores its values by column
+
+    These are created on demand by the table and hold no cells of their own.
+    Cells are materialised when the row's ``cells`` are accessed, and kept
+    by the table so that changes to them stick."""
+    __slots__ = ('_index',)
+
+    def __init__(self, parent, index):
+        self.parent = parent
+        self.max_len = None
+        self._row_format = None
+        self._above = []
+        self._width = None
+        self._index = index
+
+    def __reduce__(self):
+        # pickled as an ordinary row, as the cells refer back to the row;
+        # cells nobody has asked for are not kept by the table for it
+        return (_unpickle_row, (TableRow, self._render_cells(), None, None))
+
+    # the rows are made afresh for each render, so there is nothing to cache
+    def _render_html(self, above, cur, formatters, styles, col_styles=None,
+                     keep=False):
+        return self._html(above, cur, formatters, styles, col_styles)
+
+    def _render_latex(self, above, cur, formatters, keep=False):
+        return self._latex(above, cur, formatters)
+
+    @property
+    def cells(self):
+        return _ColumnarCells(self)
+
+    def _render_cells(self):
+        # cells nobody has asked for are only created for the render
+        table, r = self.parent, self._index
+        sparse = table._sparse.get(r, {})
+        return [sparse[c] if c in sparse else TableCell(col[r])
+                for c, col in enumerate(table._columns)]
+
+    def _is_plain(self):
+        return self._index not in self.parent._sparse
+
+    def _key(self):
+        # the row objects are made afresh, so the index stands for the row
+        return self._index
+
+    def column_count(self, debug=False):
+        if not debug and self._is_plain():
+            return len(self.parent._columns)
+        # the cells are shared with other row objects, so nothing is kept;
+        # _count_columns goes over _render_cells, which keeps no new cells
+        return self._count_columns(debug)
+
+    def append_cell(self, c):
+        raise TypeError('Cells cannot be appended to a row of a columnar '
+                        'table; use Table.append_row')
+
+    @property
+    def row_format(self):
+        return None
+    @row_format.setter
+    def row_format(self, val):
+        # the row objects are made afresh, so the format would be lost
+        raise TypeError('A row of a columnar table has no format of its own; '
+                        'use Table.col_format')
+
+    def _html(self, above, cur, formatters=None, styles=None, col_styles=None):
+        # cells may have been materialised since the layout was built
+        if cur is not None or not self._is_plain():
+            if cur is None:
+                cur = self._spans(above)
+            return super(_ColumnarRow, self)._html(above, cur, formatters,
+                                                   styles, col_styles)
+        # A plain row: every value in its own cell, formatted with the column
+        # format.  This is the markup TableCell._repr_html_ gives such a cell.
+        values = self.parent._formatted_row(self._index, _html_escape_values)
+        if len(values) == 0:
+            return '<tr></tr>'
+        if col_styles:
+            parts = ['<tr>']
+            for value, style in zip(values, col_styles):
+                start, end = _cell_tags(False, 1, 1, style, styles)
+                parts.append(start + value + end)
+            parts.append('</tr>')
+            return ''.join(parts)
+        return '<tr><td  >' + '</td><td  >'.join(values) + '</td></tr>'
+
+
+    def _latex(self, above, cur, formatters=None):
+        if cur is not None or not self._is_plain():
+            if cur is None:
+                cur = self._spans(above)
+            return super(_ColumnarRow, self)._latex(above, cur, formatters)
+        return ' & '.join(self.parent._formatted_row(self._index,
+                                                     _latex_escape_values)
+                          ) + '\\\\'
+
+    def _texts(self, above, cur, formatters=None):
+        if cur is not None or not self._is_plain():
+            if cur is None:
+                cur = self._spans(above)
+            return super(_ColumnarRow, self)._texts(above, cur, formatters)
+        return [(value, 1, 1) for value in
+                self.parent._formatted_row(self._index)]
+
+class _JoinedRow(TableRow):
+    """A row of a table made by putting tables side by side with
+    Table.concat, made of one row of each of them
+
+    The cells stay with those rows and are not copied.  As changes to the
+    cells are only passed on to the rows holding them, nothing is cached."""
+    __slots__ = ('_parts',)
+
+    def __init__(self, parts):
+        # parts are (row, number of columns) for each table
+        self.parent = None
+        self.max_len = None
+        self._row_format = None
+        self._above = []
+        self._width = None
+        self._parts = parts
+
+    def __reduce__(self):
+        # pickled as an ordinary row of copies of the cells
+        cls = TableHeaderRow if isinstance(self, TableHeaderRow) else TableRow
+        row_format = None
+        if any(row.row_format for row, ncols in self._parts):
+            col_format = self.parent.col_format if self.parent else None
+            row_format = []
+            offset = 0
+            for row, ncols in self._parts:
+                row_format.extend(row.row_format or
+                                  (col_format[offset:offset + ncols]
+                                   if col_format else ('{}',) * ncols))
+                offset += ncols
+        return (_unpickle_row, (cls, self.cells, None, row_format))
+
+    def _render_html(self, above, cur, formatters, styles, col_styles=None,
+                     keep=False):
+        return self._html(above, cur, formatters, styles, col_styles)
+
+    def _render_latex(self, above, cur, formatters, keep=False):
+        return self._latex(above, cur, formatters)
+
+    def _join(self, cells):
+        "The cells of the parts, each cut or padded to its number of columns"
+        joined = []
+        for part, (row, ncols) in zip(cells, self._parts):
+            joined.extend(part[:ncols])
+            joined.extend(TableCell('') for c in range(ncols - len(part)))
+        return joined
+
+    @property
+    def cells(self):
+        return self._join([row.cells for row, ncols in self._parts])
+
+    def _render_cells(self):
+        return self._join([row._render_cells() for row, ncols in self._parts])
+
+    def _is_plain(self):
+        return all(row._is_plain() for row, ncols in self._parts)
+
+    def column_count(self, debug=False):
+        if debug:
+            return self._count_columns(debug)
+        return sum(ncols for row, ncols in self._parts)
+
+    def append_cell(self, c):
+        raise TypeError('Cells cannot be appended to a row of a table made '
+                        'with Table.concat')
+
+    def _cell_formatters(self, formatters):
+        # each part keeps the row format of its own row
+        if all(row.row_format is None for row, ncols in self._parts):
+            return formatters
+        joined = []
+        offset = 0
+        for row, ncols in self._parts:
+            part = formatters[offset:offset + ncols] if formatters else None
+            joined.extend(row._cell_formatters(part) or
+                          [_default_format] * ncols)
+            offset += ncols
+        return joined
+
+class _JoinedHeaderRow(_JoinedRow, TableHeaderRow):
+    "A _JoinedRow made of header rows"
+    __slots__ = ()
+
+def _changes(values):
+    """For each of the values, whether it differs from the one before it,
+    the first one included, as a list of booleans"""
+    np = sys.modules.get('numpy')
+    if (np is not None and isinstance(values, np.ndarray) and
+            values.dtype.kind != 'O'):
+        changed = np.ones(len(values), dtype=bool)
+        np.not_equal(values[1:], values[:-1], out=changed[1:])
+        return changed.tolist()
+    return [True] * min(len(values), 1) + list(map(ne, values[1:],
+                                                    values[:-1]))
+
+def _format_values(values, formatter=_default_format):
+    """Format a sequence of values with a compiled format in one go
+
+    NumPy arrays whose items convert to Python numbers without changing how
+    they are formatted are converted as a whole first, which is much faster
+    than formatting the NumPy scalars one by one."""
+    # an array can only exist if numpy has been imported already
+    np = sys.modules.get('numpy')
+    if np is not None and isinstance(values, np.ndarray):
+        kind = values.dtype.kind
+        # float32 and smaller print shorter than the Python float they give
+        if kind in 'biu' or (kind == 'f' and values.dtype.itemsize == 8):
+            values = values.tolist()
+    return list(map(formatter, values))
+
+class _ColumnarCells(Sequence):
+    "The cells of a _ColumnarRow, materialised as they are accessed"
+    def __init__(self, row):
+        self._row = row
+
+    def __len__(self):
+        return len(self._row.parent._columns)
+
+    def __getitem__(self, col):
+        n = len(self)
+        if isinstance(col, slice):
+            return [self[c] for c in range(*col.indices(n))]
+        if col < 0:
+            col += n
+        if not 0 <= col < n:
+            raise IndexError('cell index out of range')
+        return self._row.parent._materialise(self._row._index, col)
+
+class _ColumnarRows(Sequence):
+    """The rows of a table that stores its values by column
+
+    The header rows, if any, are ordinary rows; the data rows are
+    _ColumnarRow instances created when they are accessed."""
+    def __init__(self, table, head):
+        self._table = table
+        self._head = head
+
+    def __len__(self):
+        return len(self._head) + self._table._nrows
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError('row index out of range')
+        nhead = len(self._head)
+        if index < nhead:
+            return self._head[index]
+        return _ColumnarRow(self._table, index - nhead)
+
+    def __iter__(self):
+        for row in self._head:
+            yield row
+        for index in range(self._table._nrows):
+            yield _ColumnarRow(self._table, index)
+
+    def append(self, row):
+        self._table._append_values(row)
+
+class _StreamedRows(object):
+    """The rows of a table made with Table.from_iter
+
+    The header rows are kept; the other rows are made from the items of the
+    iterable while the table is rendered, and dropped once they have been
+    rendered, so they can only be gone through once."""
+    def __init__(self, table, head, iterable):
+        self._table = table
+        self._head = head
+        self._items = iter(iterable)
+        # the first row, if it was needed before the rendering began
+        self._peeked = []
+        self._used = False
+
+    def first(self):
+        "The first row, or None if there are no rows"
+        if self._head:
+            return self._head[0]
+        if not self._peeked and not self._used:
+            for item in self._items:
+                self._peeked.append(self._row(item, None))
+                break
+        return self._peeked[0] if self._peeked else None
+
+    def __iter__(self):
+        if self._used:
+            raise RuntimeError('The rows of a table made with '
+                               'Table.from_iter can only be rendered once')
+        self._used = True
+        return self._rows()
+
+    def _rows(self):
+        width = None
+        for row in chain(self._head, self._peeked):
+            if width is None:
+                width = row.column_count()
+            yield row
+        del self._peeked[:]
+        for item in self._items:
+            row = self._row(item, width)
+            if width is None:
+                width = row.column_count()
+            yield row
+
+    def _row(self, item, width):
+        """A row of the table made from an item of the iterable, padded to
+        width like the rows given to Table"""
+        row = item
+        if not isinstance(row, TableRow):
+            row = TableRow(*item, max_len=width)
+        if width is not None and row.column_count() > width:
+            raise ValueError('Row has more columns than the table')
+        row.set_parent(self._table)
+        return row
+
+def _render_chunk(chunk, kind):
+    """Render the rows of a table made by Table._chunk, in a worker process
+
+    Returns the rendered rows and the styles they use."""
+    warnings.simplefilter('ignore')
+    styles = set()
+    if kind == 'html':
+        return list(chunk._rows_html(styles)), styles
+    return list(chunk._rows_latex()), styles
+
+class _TablePage(object):
+    "A page of the rows of a table; see Table.page"
+    def __init__(self, table, n, size):
+        if n < 0 or size < 1:
+            raise ValueError('Invalid page')
+        self.table = table
+        self.n = n
+        self.size = size
+
+    def _repr_html_(self):
+        table = self.table
+        nhead = table._header_count()
+        nrows = len(table.rows) - nhead
+        start = min(nhead + self.n * self.size, len(table.rows))
+        stop = min(start + self.size, len(table.rows))
+        if start == nhead:
+            # the page follows on from the header
+            segments = [range(stop)]
+        else:
+            segments = [range(nhead), range(start, stop)]
+        parts = ['<table>\n']
+        styles = set()
+        for segment in segments:
+            for html in table._clipped_html(segment, styles):
+                parts.append(html + '\n')
+        first, last = start - nhead + 1, stop - nhead
+        summary = (u'rows %d\u2013%d of %d' % (first, last, nrows)
+                   if last >= first else u'no rows (%d in all)' % nrows)
+        parts.append(table._summary_html(summary) + '\n')
+        parts.append('</table>')
+        if styles:
+            parts.append('\n' + _style_html(styles))
+        return ''.join(parts)
+
+# updates the rows of a live table shown in the notebook in place
+_LIVE_SCRIPT = u'''(function () {
+  var table = document.getElementById(%s);
+  if (!table) return;
+  %s.forEach(function (row) { table.rows[row[0]].outerHTML = row[1]; });
+})();'''
+
+class _LiveTable(object):
+    """A table shown in the notebook that is updated in place; see
+    Table.live"""
+    def __init__(self, table):
+        if table._streamed():
+            raise TypeError('A table made with Table.from_iter cannot be '
+                            'shown live')
+        self.table = table
+        self.display_id = 'tabipy-live-%s' % uuid.uuid4().hex
+        # keys of the rows changed since the last render, None for all
+        self._changes = set()
+        # what the rows were last rendered with
+        self._index = None
+        self._nrows = None
+        self._formatters = None
+        self._styles = None
+        if table._live is None:
+            table._live = WeakSet()
+        table._live.add(self)
+
+    def _html(self):
+        "Render the whole table, with the id the updates find it by"
+        table = self.table
+        self._changes.clear()
+        styles = set()
+        parts = ['<table id="%s">\n' % self.display_id]
+        parts.extend(html + '\n' for html in table._rows_html(styles, True))
+        parts.append('</table>')
+        if styles:
+            parts.append('\n' + _style_html(styles))
+        # columnar rows are known by their index below the header rows
+        rows = table.rows._head if table._columns is not None else table.rows
+        self._index = dict((id(row), r) for r, row in enumerate(rows))
+        self._nrows = len(table.rows)
+        self._formatters = table._formatters()
+        self._styles = styles
+        return ''.join(parts)
+
+    def _repr_html_(self):
+        return self._html()
+
+    def patch(self):
+        """The changes to the table since it was last rendered, as (html,
+        rows): html is the whole table, if it has to be sent again, or None,
+        and rows a list of (index, HTML) for the rows that changed
+
+        The table is sent again after changes to its spans, column formats or
+        column styles, and after rows are added or removed."""
+        table = self.table
+        keys = list(self._changes)
+        if (self._index is None or None in keys or
+                len(table.rows) != self._nrows or
+                table._formatters() is not self._formatters):
+            return self._html(), []
+        self._changes.clear()
+        nhead = table._header_count()
+        indices = []
+        for key in keys:
+            r = self._index.get(id(key))
+            if r is None and isinstance(key, int):
+                r = nhead + key
+            if r is None:
+                # a row that is not in the table, such as that of one of
+                # the tables it was made from by concat
+                return self._html(), []
+            indices.append(r)
+        styles = set()
+        rows = [(r, table._row_html(r, styles)) for r in sorted(indices)]
+        if not styles <= self._styles:
+            # the style element would need new classes
+            return self._html(), []
+        return None, rows
+
+    def show(self):
+        "Display the table in the notebook; it is updated by update"
+        from IPython.display import HTML, display
+        display(HTML(self._html()), display_id=self.display_id)
+        # where the updates are sent
+        display(HTML(''), display_id=self.display_id + '-update')
+
+    def update(self):
+        """Send the rows changed since the table was last shown or updated to
+        the notebook, or the whole table if need be"""
+        from IPython.display import HTML, Javascript, update_display
+        html, rows = self.patch()
+        if html is not None:
+            update_display(HTML(html), display_id=self.display_id)
+            # updates already sent no longer apply
+            update_display(HTML(''), display_id=self.display_id + '-update')
+        elif rows:
+            script = _LIVE_SCRIPT % (json.dumps(self.display_id),
+                                     json.dumps([list(row) for row in rows]))
+            update_display(Javascript(script),
+                           display_id=self.display_id + '-update')
+
+def _row_spans(rows):
+    """Generate (row, above, cur) for each of the rows
+
+    above is the span information the row is rendered with, which is []
+    where nothing from the rows above reaches into the row, and cur is that
+    of the row itself, as given by ``TableRow._current``, or None for a
+    plain row.  Only the span information of the row above is kept."""
+    above = []
+    for row in rows:
+        if len(above)==0 and row._is_plain():
+            # nothing spans into or out of the row
+            yield row, above, None
+            continue
+        cur = row._spans(above)
+        yield row, above, cur
+        above = cur if any(rs != 1 for rs, cs in cur) else []
+
+def _select(items, index):
+    """The items picked by index: an int, a slice, a sequence of ints or
+    a sequence of booleans, one for each item"""
+    if isinstance(index, slice):
+        return items[index]
+    # NumPy arrays have __index__ too, so integers are told by their type
+    if isinstance(index, numbers.Integral):
+        return [items[index]]
+    index = list(index)
+    # an array of booleans can only exist if numpy has been imported already
+    np = sys.modules.get('numpy')
+    bools = (bool,) if np is None else (bool, np.bool_)
+    if index and all(isinstance(i, bools) for i in index):
+        if len(index) != len(items):
+            raise IndexError('Wrong number of values in the mask')
+        return [item for item, keep in zip(items, index) if keep]
+    return [items[i] for i in index]
+
+class _TableView(object):
+    """Some rows and columns of a table, in some order; see Table.sort_by,
+    Table.filter and Table.__getitem__
+
+    A view holds the indices of its rows and columns in the table and
+    nothing else, and renders the cells of the table with its formats.  The
+    header rows at the top of the table are shown at the top of every view.
+    Spans are clipped to the rows and columns shown, as for max_rows."""
+    def __init__(self, table, indices, cols=None):
+        self.table = table
+        # the rows below the header rows, as indices in table.rows
+        self._indices = indices
+        self._cols = cols
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __repr__(self):
+        return '<view of %d row%s x %d column%s of %r>' % (
+            len(self), 's' if len(self) != 1 else '', self._ncols(),
+            's' if self._ncols() != 1 else '', self.table)
+
+    def _ncols(self):
+        if self._cols is None:
+            return self.table.column_count()
+        return len(self._cols)
+
+    def _values(self, col, indices=None):
+        """The values in column col, counting columns of the view, of the
+        rows with the given indices, by default those of the view"""
+        table = self.table
+        col = col if self._cols is None else self._cols[col]
+        values = table._data_column(col)
+        nhead = table._header_count()
+        if indices is None:
+            indices = self._indices
+        return [values[r - nhead] for r in indices]
+
+    def sort_by(self, col, reverse=False, key=None):
+        """A view of these rows sorted by the values in column col, or in
+        the columns in col if it is a list, the first of them first
+
+        key, if given, is applied to each value, once.  The sort is stable.
+        Columns are counted in the view."""
+        indices = list(self._indices)
+        cols = col if isinstance(col, (list, tuple)) else [col]
+        for col in reversed(cols):
+            keys = self._values(col, indices)
+            if key is not None:
+                keys = [key(value) for value in keys]
+            order = sorted(range(len(keys)), key=keys.__getitem__,
+                           reverse=reverse)
+            indices = [indices[i] for i in order]
+        return _TableView(self.table, indices, self._cols)
+
+    def filter(self, pred, col=None):
+        """A view of the rows where pred holds
+
+        pred is called with a tuple of the values of each row or, if col is
+        given, with the values of that column, as for Table.style_where."""
+        if col is not None:
+            keep = _matches(pred, self._values(col))
+        else:
+            columns = [self._values(c) for c in range(self._ncols())]
+            keep = [bool(pred(values)) for values in zip(*columns)]
+        return _TableView(self.table, [r for r, k in zip(self._indices, keep)
+                                       if k], self._cols)
+
+    def __getitem__(self, index):
+        """A view of some of the rows and columns: view[rows] or
+        view[rows, cols], where each is an int, a slice, a sequence of ints or
+        a sequence of booleans, and rows are counted below the header rows"""
+        rows, cols = index if isinstance(index, tuple) else (index, None)
+        indices = _select(list(self._indices), rows)
+        if cols is not None:
+            all_cols = (list(range(self.table.column_count()))
+                        if self._cols is None else self._cols)
+            cols = _select(all_cols, cols)
+        else:
+            cols = self._cols
+        return _TableView(self.table, indices, cols)
+
+    def _rows(self):
+        "The indices in table.rows of the rows shown"
+        return list(range(self.table._header_count())) + list(self._indices)
+
+    def iter_html(self):
+        "Generate the HTML for the view in chunks, as Table.iter_html does"
+        styles = set()
+        yield '<table>\n'
+        for html in self.table._clipped_html(self._rows(), styles, self._cols):
+            yield html + '\n'
+        yield '</table>'
+        if styles:
+            yield '\n' + _style_html(styles)
+
+    def _repr_html_(self):
+        return ''.join(self.iter_html())
+
+    def iter_latex(self, environment='tabular'):
+        "Generate the LaTeX for the view in chunks, as Table.iter_latex does"
+        rows_latex = self.table._clipped_latex(self._rows(), self._cols)
+        return self.table._wrap_latex(rows_latex, environment, self._ncols())
+
     def _repr_latex_(self):
-        return super(TableHeaderRow, self)._repr_latex_() + '\\\nhline'
+        return ''.join(self.iter_latex())
+
+class _SpanGrid(object):
+    """Occupancy index of a table, built in a single pass over its rows
+
+    ``spans[r]`` is the span information of row r, as given by
+    ``TableRow._current``, and ``owners[r][c]`` is the (row, column) address
+    of the cell occupying slot (r, c).  A slot covered by a row or column
+    span is owned by the cell the span starts from.  Both are None for a
+    plain row, where no spans are involved and each slot owns itself."""
+    def __init__(self, rows):
+        self.nrows = len(rows)
+        self.spans = []
+        self.owners = []
+        # the span information each row is rendered with, which is [] where
+        # nothing from the rows above reaches into the row
+        self._above = []
+        owners_above = None
+        for r, (row, above, cur) in enumerate(_row_spans(rows)):
+            self._above.append(above)
+            self.spans.append(cur)
+            if cur is None:
+                self.owners.append(None)
+                continue
+            abv = [[1,1] for c in cur] if len(above)==0 else above
+            owners = []
+            index = 0
+            for count, values in enumerate(zip(abv, cur)):
+                (a_row, a_col), (c_row, c_col) = values
+                if index == count:
+                    # same traversal as TableRow._html: a slot either starts
+                    # a cell of this row or is covered by a cell from above
+                    covered = a_row != 1
+                    start = count
+                    index += a_col if covered else c_col
+                owners.append(owners_above[count] if covered else (r, start))
+            self.owners.append(owners)
+            owners_above = owners
+
+    def above(self, r):
+        "Span information of the row above row r"
+        return self._above[r]
 
 class Table(object):
     def __init__(self, *rows, **kwargs):
         self.rows = []
+        self._span_grid = None
         self.has_header = False
+        # values stored by column and cells kept for them (row -> col -> cell)
+        # in tables made with Table.from_columns
+        self._columns = None
+        self._sparse = None
+        # True while the columns are also those of other tables; see concat
+        self._columns_shared = False
+        # tables made from this one by concat, whose layout depends on it
+        self._dependents = None
+        # (table, first column) of the columnar tables this one was put
+        # together from side by side by concat, which share their cells
+        self._sources = None
+        # the live displays of the table; see Table.live
+        self._live = None
+        self._format_block = None
+        self._formatters_cache = None
+        # styles given to whole columns; see _style_mask
+        self._style_masks = {}
+        # remember formatted values of the columns; see _memoize
+        self.memo_formats = kwargs.get('memo_formats', False)
+        # most rows shown in the notebook, apart from the header rows
+        self.max_rows = kwargs.get('max_rows', None)
 
         # if argument is a single dict, convert it to a table with keys
         # as header
@@ -333,7 +1610,7 @@ class Table(object):
         
             self.append_row(r, max_len)
             if index==0:
-                max_len = self.rows[0].column_count()
+                max_len = self.column_count()
 
         col_format = kwargs.get('col_format')
         if col_format:
@@ -342,44 +1619,1400 @@ class Table(object):
                raise ValueError('Wrong number of format strings')
         self.col_format = col_format
             
-    def cell(self, row, col):
+    def __repr__(self):
+        # a summary, as the rows may be many
+        columns = self.column_count()
+        if self._streamed():
+            return '<Table of rows from an iterable, %d column%s>' % (
+                columns, 's' if columns != 1 else '')
+        nrows, nhead = len(self.rows), self._header_count()
+        text = '<Table: %d row%s x %d column%s' % (
+            nrows, 's' if nrows != 1 else '', columns,
+            's' if columns != 1 else '')
+        if nhead:
+            text += ', %d header row%s' % (nhead, 's' if nhead != 1 else '')
+        if self._columns is not None:
+            text += ', stored by column'
+        return text + '>'
+
+    def cell(self, row, col, owner=False):
         """Allows for direct addressing of individual cells (row, column)
 
         Any value not entered will remain unchanged.
-        Address is (row, column) with an origin index of 0."""
+        Address is (row, column) with an origin index of 0.  If owner is True
+        and the slot is covered by the span of another cell, that cell is
+        returned instead."""
+        if owner:
+            owners = self._grid().owners[row]
+            if owners is not None:
+                row, col = owners[col]
         Row = self.rows[row]
         cell = Row.cells[col]
         return cell
     
+    @classmethod
+    def from_columns(cls, columns, header=None, col_format=None):
+        """Create a table that stores its values by column
+
+        columns is a sequence of columns, each a list, tuple or array of
+        values, or a mapping of header to column.  header is an optional
+        sequence of column headers.  Shorter columns are padded with ''.
+
+        The columns are kept as they are rather than being turned into a
+        TableCell per value.  A cell is only created when it is accessed,
+        for instance through ``Table.cell``, and is kept from then on so that
+        it can carry formatting and spans."""
+        if isinstance(columns, Mapping):
+            header = list(columns.keys())
+            columns = list(columns.values())
+        columns = list(columns)
+        nrows = max(len(col) for col in columns) if columns else 0
+        for index, col in enumerate(columns):
+            if len(col) < nrows:
+                columns[index] = list(col) + [''] * (nrows - len(col))
+        table = cls()
+        table._columns = columns
+        table._nrows = nrows
+        table._sparse = {}
+        head = []
+        if header is not None:
+            if len(header) != len(columns):
+                raise ValueError('Wrong number of headers')
+            head.append(TableHeaderRow(*header))
+        table.rows = _ColumnarRows(table, head)
+        for row in head:
+            row.set_parent(table)
+        if col_format and len(col_format) != len(columns):
+            raise ValueError('Wrong number of format strings')
+        table.col_format = col_format
+        return table
+
+    @classmethod
+    def from_array(cls, array, headers=None, col_format=None):
+        """Create a table from a two dimensional NumPy array
+
+        The columns of the table are views of the columns of the array, and
+        whole columns are formatted at once when the table is rendered.
+        headers is an optional sequence of column headers."""
+        if array.ndim != 2:
+            raise ValueError('Expected a two dimensional array')
+        columns = [array[:, c] for c in range(array.shape[1])]
+        return cls.from_columns(columns, header=headers, col_format=col_format)
+
+    @classmethod
+    def from_dataframe(cls, df, col_format=None, index=False):
+        """Create a table from a pandas DataFrame
+
+        The column names become the header row.  If index is True, the index
+        of the frame is included as the first column."""
+        header = [u'{}'.format(name) for name in df.columns]
+        # by position, as names may be repeated
+        columns = [df.iloc[:, i].values for i in range(df.shape[1])]
+        if index:
+            header.insert(0, u'{}'.format(df.index.name or ''))
+            columns.insert(0, df.index.values)
+        return cls.from_columns(columns, header=header, col_format=col_format)
+
+    @classmethod
+    def from_iter(cls, iterable, header=None, col_format=None):
+        """Create a table whose rows are taken from an iterable as it is
+        rendered
+
+        iterable gives the rows, each a sequence of values or cells or a
+        TableRow, for instance a generator, a database cursor or a CSV reader.
+        header is an optional sequence of column headers.
+
+        The rows are not kept: each is made, rendered and dropped in turn,
+        with only the span information of the row above kept, so that
+        ``write_html`` and ``write_latex`` run in constant memory.  The table
+        can therefore only be rendered once, and rows cannot be appended to
+        it or looked up.  For the same reason the notebook shows only a
+        summary of it; render it with write_html, render_html and the like."""
+        table = cls()
+        head = []
+        if header is not None:
+            head.append(TableHeaderRow(*header))
+            if col_format and len(col_format) != len(header):
+                raise ValueError('Wrong number of format strings')
+        table.rows = _StreamedRows(table, head, iterable)
+        for row in head:
+            row.set_parent(table)
+        table.col_format = col_format
+        return table
+
+    @classmethod
+    def concat(cls, tables, axis=0):
+        """Create a table of tables put one below the other (axis 0) or side
+        by side (axis 1)
+
+        The new table refers to the rows of the tables, or to their columns
+        if they all store their values by column, instead of copying them,
+        and no cell is looked at, so the time taken does not grow with the
+        number of cells.  Changes to the cells show in both tables; tables
+        that store their values by column share the cells created for them
+        in either table later as well.
+        Column styles given with style_where and the like are not carried
+        over.
+
+        With axis 0 the tables must have as many columns and the same column
+        formats.  The header rows of the first table that has any are kept
+        at the top; those of the other tables are left out.  With axis 1 the
+        tables must have as many rows below their header rows, and a table
+        with fewer header rows than the others is given blank ones."""
+        tables = list(tables)
+        if axis not in (0, 1):
+            raise ValueError('axis must be 0 or 1')
+        if any(t._streamed() for t in tables):
+            raise TypeError('Tables made with Table.from_iter cannot be '
+                            'concatenated')
+        table = cls()
+        heads = [t._header_count() for t in tables]
+        # the widths the tables keep, not those of each row
+        widths = [t.column_count() for t in tables]
+        if axis == 0:
+            used = [t for t in tables if len(t.rows)]
+            if len(set(t.column_count() for t in used)) > 1:
+                raise ValueError('Tables have different numbers of columns')
+            # no column format is the same as '{}' for every column
+            formats = set(tuple(t.col_format or ('{}',) * ncols)
+                          for t, ncols in zip(tables, widths) if len(t.rows))
+            if len(formats) > 1:
+                raise ValueError('Tables have different column formats')
+            rows = next((t.rows[:n] for t, n in zip(tables, heads) if n), [])
+            rows = list(rows)
+            for t, n in zip(tables, heads):
+                rows.extend(t.rows[n:])
+            table.rows = rows
+            table.col_format = used[0].col_format if used else None
+        else:
+            nrows = set(len(t.rows) - n for t, n in zip(tables, heads))
+            if len(nrows) > 1:
+                raise ValueError('Tables have different numbers of rows')
+            nhead = max(heads) if heads else 0
+            head = []
+            for r in range(nhead):
+                parts = []
+                for t, n, ncols in zip(tables, heads, widths):
+                    skip = nhead - n
+                    row = (t.rows[r - skip] if r >= skip else
+                           TableHeaderRow(*[''] * ncols))
+                    parts.append((row, ncols))
+                head.append(_JoinedHeaderRow(parts))
+            if tables and all(t._columns is not None for t in tables):
+                table._columns = [col for t in tables for col in t._columns]
+                table._nrows = nrows.pop()
+                table._sparse = {}
+                table._sources = []
+                offset = 0
+                for t, ncols in zip(tables, widths):
+                    for r, cells in t._sparse.items():
+                        table._sparse.setdefault(r, {}).update(
+                            (c + offset, cell) for c, cell in cells.items())
+                    table._sources.append((t, offset))
+                    offset += ncols
+                    t._columns_shared = True
+                table._columns_shared = True
+                table.rows = _ColumnarRows(table, head)
+            else:
+                body = [t.rows[n:] for t, n in zip(tables, heads)]
+                table.rows = head + [_JoinedRow(list(zip(rows, widths)))
+                                     for rows in zip(*body)]
+            for row in head if table._columns is not None else table.rows:
+                row.set_parent(table)
+            col_format = None
+            if any(t.col_format for t in tables):
+                col_format = []
+                for t, ncols in zip(tables, widths):
+                    col_format.extend(t.col_format or ('{}',) * ncols)
+            table.col_format = col_format
+        table.has_header = any(t.has_header for t in tables)
+        for t in tables:
+            if t._dependents is None:
+                t._dependents = WeakSet()
+            t._dependents.add(table)
+        return table
+
+    def _streamed(self):
+        "True for a table made with Table.from_iter"
+        return isinstance(self.rows, _StreamedRows)
+
+    def _materialise(self, r, c):
+        "The cell for value c of data row r of a columnar table"
+        sparse = self._sparse.setdefault(r, {})
+        cell = sparse.get(c)
+        if cell is None:
+            cell = self._source_cell(r, c)
+            if cell is None:
+                cell = TableCell(self._columns[c][r])
+                cell._row = _ColumnarRow(self, r)
+                self._share_cell(r, c, cell)
+            sparse[c] = cell
+        return cell
+
+    def _source_cell(self, r, c):
+        """The cell of the table the value c of data row r was taken from by
+        concat, or None if it was not"""
+        for table, offset in self._sources or ():
+            if (offset <= c < offset + len(table._columns) and
+                    r < table._nrows):
+                return table._materialise(r, c - offset)
+        return None
+
+    def _share_cell(self, r, c, cell):
+        """Give the tables put together from this one and others by concat
+        the cell just made for value c of data row r"""
+        for table in list(self._dependents or ()):
+            for source, offset in table._sources or ():
+                if source is self and r < table._nrows:
+                    table._sparse.setdefault(r, {}).setdefault(c + offset,
+                                                               cell)
+
+    def _append_values(self, r):
+        "Append a row to a columnar table"
+        cells = r.cells if isinstance(r, TableRow) else r
+        width = len(self._columns)
+        if len(cells) > width:
+            raise ValueError('Row has more columns than the table')
+        cells = list(cells) + [''] * (width - len(cells))
+        if self._columns_shared:
+            # the columns are not grown in place under other tables
+            self._columns = [list(col) for col in self._columns]
+            self._columns_shared = False
+        index = self._nrows
+        for c, value in enumerate(cells):
+            col = self._columns[c]
+            if not isinstance(col, list):
+                # arrays and tuples cannot grow
+                col = self._columns[c] = list(col)
+            if isinstance(value, TableCell):
+                cell, value = value, value.value
+                cell._row = _ColumnarRow(self, index)
+                self._sparse.setdefault(index, {})[c] = cell
+            col.append(value)
+        self._nrows += 1
+        self._format_block = None
+
+    # number of rows of a columnar table formatted together
+    _format_block_rows = 1024
+
+    def _formatted_row(self, r, escape=None):
+        """The formatted values of data row r of a columnar table, escaped
+        with escape, _html_escape_values or _latex_escape_values, if given
+
+        Values are formatted a block of rows at a time, column by column."""
+        formatters = (self._formatters() or
+                      [_default_format] * len(self._columns))
+        start = r - r % self._format_block_rows
+        block = self._format_block
+        if (block is None or block[0] != start or block[1] != formatters or
+                block[2] is not escape):
+            stop = min(start + self._format_block_rows, self._nrows)
+            values = [_format_values(col[start:stop], formatter)
+                      for col, formatter in zip(self._columns, formatters)]
+            if escape is not None:
+                values = [escape(col) for col in values]
+            block = self._format_block = (start, formatters, escape,
+                                          list(zip(*values)))
+        return block[3][r - start]
+
+    def _formatters(self):
+        """The compiled column formats, or None if there are none
+
+        They are compiled once and kept until the column formats change."""
+        if not self.col_format:
+            return None
+        key = (tuple(self.col_format), self.memo_formats)
+        cached = self._formatters_cache
+        if cached is None or cached[0] != key:
+            formatters = [_compile_format(f) for f in self.col_format]
+            if self.memo_formats:
+                formatters = [_memoize(f) for f in formatters]
+            cached = self._formatters_cache = (key, formatters)
+        return cached[1]
+
+    def style_where(self, col, where, bg_colour=None, text_colour=None):
+        """Colour the cells of column col where a condition holds
+
+        where is a function of the values of the column, such as
+        ``lambda v: v > 0``, or a sequence of booleans, one for each row
+        below the header rows.  With NumPy the function is given the whole
+        column as an array at once; see _matches.  Cells that match are given
+        the colours, replacing those given to them by earlier calls; without
+        any colours, their colours are removed.  The colours of cells set
+        with their own bg_colour and text_colour take precedence.
+
+        Only a small code per row is stored for the column, not a style per
+        cell."""
+        matches = _matches(where, self._data_column(col))
+        palette, codes = self._style_mask(col)
+        code = self._style_code(palette, _make_style(bg_colour, text_colour))
+        np = _numpy()
+        if np is not None:
+            codes[np.asarray(matches, dtype=bool)] = code
+        else:
+            for r, match in enumerate(matches):
+                if match:
+                    codes[r] = code
+
+    def style_gradient(self, col, low='#ffffff', high='#f8696b', steps=16,
+                       vmin=None, vmax=None, text_colour=None):
+        """Colour the background of column col from low, for its smallest
+        values, to high, for its largest
+
+        The colours, given as '#rrggbb', are blended in steps steps.  vmin and
+        vmax, if given, are the values that get low and high, beyond which
+        the colours go no further.  Values that are not numbers are left
+        as they are."""
+        numbers = _numbers(self._data_column(col))
+        found = _number_range(numbers)
+        if found is None:
+            return
+        vmin = found[0] if vmin is None else vmin
+        vmax = found[1] if vmax is None else vmax
+        palette, codes = self._style_mask(col)
+        step_codes = [self._style_code(palette, Style(colour, text_colour))
+                      for colour in _colour_steps(low, high, steps)]
+        scale = (steps - 1) / float(vmax - vmin) if vmax > vmin else 0.0
+        np = _numpy()
+        if np is not None:
+            valid = ~np.isnan(numbers)
+            levels = np.clip(np.rint((numbers[valid] - vmin) * scale),
+                             0, steps - 1).astype(int)
+            codes[valid] = np.asarray(step_codes, dtype=codes.dtype)[levels]
+        else:
+            for r, x in enumerate(numbers):
+                if x == x:
+                    level = int(round((x - vmin) * scale))
+                    codes[r] = step_codes[min(max(level, 0), steps - 1)]
+
+    def heatmap(self, cols=None, low='#ffffff', high='#f8696b', steps=16,
+                text_colour=None):
+        """Colour the background of columns cols, by default all of them,
+        with style_gradient on a scale shared by all of them"""
+        cols = range(self.column_count()) if cols is None else list(cols)
+        ranges = [_number_range(_numbers(self._data_column(col)))
+                  for col in cols]
+        ranges = [found for found in ranges if found is not None]
+        if not ranges:
+            return
+        vmin = min(low for low, high in ranges)
+        vmax = max(high for low, high in ranges)
+        for col in cols:
+            self.style_gradient(col, low, high, steps, vmin, vmax,
+                                text_colour)
+
+    def merge_repeats(self, cols=None, axis='rows'):
+        """Merge runs of equal values into single cells spanning them
+
+        With axis 'rows', runs of equal values down each of the columns cols,
+        by default all of them, below the header rows are merged by setting
+        the row_span of the first cell of each run.  The columns are taken in
+        the order given, and a run in one column ends where one in a column
+        before it does, as the groups of a grouped report do.  With axis
+        'cols', runs of equal values across adjacent columns of cols in each
+        row, header rows included, are merged by setting col_span.
+
+        The other cells of a run are kept and left out when the table is
+        rendered.  Each column is gone through once and only the first cell
+        of each run is changed, so in a table stored by column the other
+        cells are never created.  This is meant for cells that do not span
+        anything yet."""
+        if self._streamed():
+            raise TypeError('Cells of a table made with Table.from_iter '
+                            'cannot be merged')
+        if axis not in ('rows', 'cols'):
+            raise ValueError("axis must be 'rows' or 'cols'")
+        cols = range(self.column_count()) if cols is None else list(cols)
+        nhead = self._header_count()
+        def merge(r, c, name, span):
+            "Set the span name of the cell at (r, c)"
+            if self._columns is not None and r >= nhead:
+                # rows of a columnar table keep nothing to drop, so the
+                # layout is only dropped once, below
+                setattr(self._materialise(r - nhead, c), '_' + name, span)
+            else:
+                setattr(self.rows[r].cells[c], name, span)
+        if axis == 'rows':
+            breaks = None
+            for col in cols:
+                changes = _changes(self._data_column(col))
+                breaks = (changes if breaks is None else
+                          list(map(or_, breaks, changes)))
+                starts = list(compress(range(len(breaks)), breaks))
+                starts.append(len(breaks))
+                for start, stop in zip(starts, starts[1:]):
+                    if stop - start > 1:
+                        merge(nhead + start, col, 'row_span', stop - start)
+            self._invalidate()
+            return
+        pairs = [(a, b) for a, b in zip(cols, cols[1:]) if b == a + 1]
+        columns = dict((c, self._data_column(c)) for pair in pairs
+                       for c in pair)
+        same = dict((a, list(map(eq, columns[a], columns[b])))
+                    for a, b in pairs)
+        # the header rows and the rows with a repeat
+        rows = sorted(set(chain(range(nhead), *(
+            (nhead + r for r in compress(range(len(found)), found))
+            for found in same.values()))))
+        for r in rows:
+            if r < nhead:
+                cells = self.rows[r].cells
+                found = [a for a, b in pairs if b < len(cells) and
+                         cells[a].value == cells[b].value]
+            else:
+                found = [a for a, b in pairs if same[a][r - nhead]]
+            spans = []
+            for a in found:
+                if spans and spans[-1][1] == a:
+                    spans[-1][1] = a + 1
+                else:
+                    spans.append([a, a + 1])
+            for start, stop in spans:
+                merge(r, start, 'col_span', stop - start + 1)
+        self._invalidate()
+
+    def _view(self):
+        "A view of the whole table"
+        if self._streamed():
+            raise TypeError('A table made with Table.from_iter has no views')
+        return _TableView(self, range(self._header_count(), len(self.rows)))
+
+    def sort_by(self, col, reverse=False, key=None):
+        """A view of the table with the rows below the header rows sorted by
+        column col; see _TableView.sort_by"""
+        return self._view().sort_by(col, reverse, key)
+
+    def filter(self, pred, col=None):
+        """A view of the table with the rows below the header rows for which
+        pred holds; see _TableView.filter"""
+        return self._view().filter(pred, col)
+
+    def __getitem__(self, index):
+        """A view of some rows and columns of the table: table[rows] or
+        table[rows, cols]; see _TableView.__getitem__"""
+        return self._view()[index]
+
+    def _data_column(self, col):
+        "The values of column col in the rows below the header rows"
+        if self._streamed():
+            raise TypeError('Columns of a table made with Table.from_iter '
+                            'cannot be styled')
+        if self._columns is not None:
+            values = self._columns[col]
+            # cells of the column that may have been given other values
+            cells = [(r, cells[col]) for r, cells in self._sparse.items()
+                     if col in cells]
+            if cells:
+                values = list(values)
+                for r, cell in cells:
+                    values[r] = cell.value
+            return values
+        return [row.cells[col].value if col < len(row.cells) else ''
+                for row in self.rows[self._header_count():]]
+
+    def _style_mask(self, col):
+        """The styles given to column col as (palette, codes)
+
+        palette is a list of the styles used, starting with None for no
+        style, and codes has the index in palette of the style of each row
+        below the header rows: a NumPy array of uint16 if NumPy is installed
+        and an array.array otherwise.  They are made, or grown to cover rows
+        appended since, as needed."""
+        nrows = len(self.rows) - self._header_count()
+        palette, codes = self._style_masks.get(col, ([None], None))
+        if codes is None or len(codes) < nrows:
+            np = _numpy()
+            if np is not None:
+                grown = np.zeros(nrows, dtype=np.uint16)
+            else:
+                grown = array('H', [0]) * nrows
+            if codes is not None:
+                grown[:len(codes)] = codes
+            codes = grown
+        self._style_masks[col] = (palette, codes)
+        if self._live:
+            # the styles of any of the rows may be changed
+            self._note_change(None)
+        return palette, codes
+
+    @staticmethod
+    def _style_code(palette, style):
+        "The index of style in palette, which it is added to if need be"
+        if style in palette:
+            return palette.index(style)
+        if len(palette) > 0xffff:
+            raise ValueError('Too many styles in one column')
+        palette.append(style)
+        return len(palette) - 1
+
+    def _styler(self):
+        """A function giving the styles the columns have in row r, through
+        style_where and the like, as a list with None for no style, or None
+        if none has one; None for a table without such styles"""
+        if not self._style_masks:
+            return None
+        nhead = self._header_count()
+        columns = [None] * self.column_count()
+        for col, (palette, codes) in self._style_masks.items():
+            if col < len(columns):
+                columns[col] = [palette[code] for code in codes.tolist()]
+        def styles(r):
+            r -= nhead
+            if r < 0:
+                return None
+            row = [column[r] if column is not None and r < len(column)
+                   else None for column in columns]
+            return row if any(style is not None for style in row) else None
+        return styles
+
     def append_row(self, r, max_len=None):
+        if self._streamed():
+            raise TypeError('Rows cannot be appended to a table made with '
+                            'Table.from_iter')
+        if self._columns is not None:
+            self._append_values(r)
+            self._invalidate()
+            return
         if not isinstance(r, TableRow):
             r = TableRow(*r, max_len=max_len, parent=self)
+        if self.rows and r.column_count() > self.column_count():
+            raise ValueError('Row has more columns than the table')
         r.set_parent(self)
         self.rows.append(r)
+        self._invalidate()
+
+    def column_count(self):
+        """The number of columns of the table, which is that of its first row
+
+        Rows keep their widths as cells are appended, so this is cheap."""
+        if self._columns is not None:
+            return len(self._columns)
+        if self._streamed():
+            first = self.rows.first()
+            return first.column_count() if first is not None else 0
+        return self.rows[0].column_count() if self.rows else 0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # compiled formats cannot be pickled; these are all rebuilt on demand
+        state.update(_span_grid=None, _formatters_cache=None,
+                     _format_block=None, _dependents=None, _live=None,
+                     _sources=None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # rows and cells are pickled without their links back to the table,
+        # through which changes to their spans reach the span layout
+        if self._columns is not None:
+            rows = self.rows._head
+            for r, cells in self._sparse.items():
+                for cell in cells.values():
+                    cell._row = _ColumnarRow(self, r)
+        elif self._streamed():
+            rows = self.rows._head
+        else:
+            rows = self.rows
+        for row in rows:
+            row.set_parent(self)
+
+    def _invalidate(self):
+        """Drop the span layout, and that of the tables made from this one by
+        concat; they are rebuilt on the next render."""
+        self._span_grid = None
+        if self._live:
+            self._note_change(None)
+        if self._dependents:
+            for table in list(self._dependents):
+                table._invalidate()
+
+    def _note_change(self, key):
+        """Let the live displays of the table, and of the tables made from it
+        by concat, know that the row with the given key changed, or that the
+        whole table did if key is None"""
+        if self._live:
+            for live in list(self._live):
+                live._changes.add(key)
+        if self._dependents:
+            # only the rows themselves are shared with those tables
+            if not isinstance(key, TableRow):
+                key = None
+            for table in list(self._dependents):
+                table._note_change(key)
+
+    def _grid(self):
+        "The span layout of the table, built once and kept until a mutation."
+        grid = self._span_grid
+        # rows may also have been added to self.rows directly
+        if grid is None or grid.nrows != len(self.rows):
+            grid = self._span_grid = _SpanGrid(self.rows)
+        return grid
+
+    def _layout(self):
+        """Generate (row, above, cur) for each row as _row_spans does, from
+        the span layout of the table where it is kept"""
+        if self._streamed():
+            return _row_spans(self.rows)
+        grid = self._grid()
+        return ((row, grid.above(r), grid.spans[r])
+                for r, row in enumerate(self.rows))
     
-    def _repr_html_(self):
-        html = '<table>\n' 
-        above = []
-        for row in self.rows:
-            row._above = above
-            html += row._repr_html_() + '\n'
-            above = row._current # Should this be passed back by the repr?
-        html += '</table>'
+    def iter_html(self, max_rows=None):
+        """Generate the HTML for the table in chunks
+
+        The opening tag, each row and the closing tag are yielded as separate
+        strings, so a large table never has to be held in memory as a whole;
+        the rows are not kept for later renders either.  The span layout of
+        the table is computed once and reused until the table is changed.
+
+        If max_rows is given and the table has more rows than that besides
+        its header rows, only the first and last rows are rendered, with a
+        row saying how many were left out in between.  This is not supported
+        for tables made with Table.from_iter, which are always rendered
+        whole.
+
+        The cells' styles are given as CSS classes, defined in a <style>
+        element that follows the table, as only then are all of them known."""
+        return self._iter_html(max_rows, False)
+
+    def _iter_html(self, max_rows, keep):
+        "iter_html, keeping the rendered rows for later renders if keep"
+        if max_rows is not None and self._streamed():
+            raise ValueError('max_rows is not supported for tables made with '
+                             'Table.from_iter')
+        nhead = self._header_count()
+        styles = set()
+        if max_rows is not None and len(self.rows) - nhead > max_rows:
+            tail = max_rows // 2
+            head = nhead + max_rows - tail
+            nrows = len(self.rows)
+            yield '<table>\n'
+            for html in self._clipped_html(range(head), styles):
+                yield html + '\n'
+            yield self._summary_html(u'\u22ee %d rows not shown'
+                                     % (nrows - head - tail)) + '\n'
+            if tail:
+                for html in self._clipped_html(range(nrows - tail, nrows),
+                                               styles):
+                    yield html + '\n'
+        else:
+            yield '<table>\n'
+            for html in self._rows_html(styles, keep):
+                yield html + '\n'
+        yield '</table>'
+        if styles:
+            yield '\n' + _style_html(styles)
+
+    def _rows_html(self, styles, keep=False):
+        """Generate the HTML of each row, adding the styles used to styles;
+        see TableRow._render_html for keep"""
+        layout = self._layout()
+        # formatted values of columnar tables are only kept for one render
+        self._format_block = None
+        formatters = self._formatters()
+        styler = self._styler()
+        if styler is None:
+            for row, above, cur in layout:
+                yield row._render_html(above, cur, formatters, styles,
+                                       keep=keep)
+            return
+        for r, (row, above, cur) in enumerate(layout):
+            yield row._render_html(above, cur, formatters, styles, styler(r),
+                                   keep)
+
+    def _row_html(self, r, styles):
+        "The HTML of row r as _rows_html gives it, on its own"
+        grid = self._grid()
+        self._format_block = None
+        col_styles = None
+        if self._style_masks:
+            # as the function _styler gives would, for this row only
+            data = r - self._header_count()
+            col_styles = [None] * self.column_count()
+            for col, (palette, codes) in self._style_masks.items():
+                if 0 <= data < len(codes) and col < len(col_styles):
+                    col_styles[col] = palette[codes[data]]
+            if all(style is None for style in col_styles):
+                col_styles = None
+        return self.rows[r]._render_html(grid.above(r), grid.spans[r],
+                                         self._formatters(), styles,
+                                         col_styles, True)
+
+    def render_html(self, workers=None):
+        """Render the table as HTML, using several processes if workers > 1
+
+        The rows are split into chunks where no row span crosses from one
+        chunk to the next, and the chunks are rendered in a process pool.
+        The result is the same as ``_repr_html_`` without max_rows.  Copying
+        the rows to the worker processes has a cost of its own, so this pays
+        off for large tables only, columnar ones especially.  Tables made
+        with Table.from_iter are always rendered in this process."""
+        if not workers or workers < 2 or self._streamed():
+            return ''.join(self._iter_html(None, not self._streamed()))
+        rows_html, styles = self._render_parallel('html', workers)
+        html = ('<table>\n' + ''.join(html + '\n' for html in rows_html) +
+                '</table>')
+        if styles:
+            html += '\n' + _style_html(styles)
         return html
 
-    def _repr_latex_(self):   
-        latex = '\\begin{tabular}{*{%d}{l}}\n'%self.rows[0].column_count()
+    def render_latex(self, workers=None, environment='tabular'):
+        """Render the table as LaTeX, using several processes if workers > 1
+
+        See ``render_html`` and ``iter_latex``."""
+        if not workers or workers < 2 or self._streamed():
+            return ''.join(self._iter_latex(environment,
+                                            not self._streamed()))
+        rows_latex = self._render_parallel('latex', workers)[0]
+        return ''.join(self._wrap_latex(rows_latex, environment))
+
+    def _render_parallel(self, kind, workers):
+        """Render the rows in chunks in a process pool; return a list of
+        them and the set of styles they use"""
+        from concurrent.futures import ProcessPoolExecutor
+        chunks = [self._chunk(start, stop)
+                  for start, stop in self._chunk_bounds(workers * 4)]
+        fragments, styles = [], set()
+        with ProcessPoolExecutor(workers) as pool:
+            for result in pool.map(_render_chunk, chunks,
+                                   [kind] * len(chunks)):
+                fragments.extend(result[0])
+                styles.update(result[1])
+        return fragments, styles
+
+    def _chunk_bounds(self, n):
+        """Split the rows into about n ranges (start, stop), where no span
+        reaches across from one range to the next"""
+        grid = self._grid()
+        nrows = len(self.rows)
+        size = max(nrows // n, 1)
+        bounds = []
+        start = 0
+        for r in range(size, nrows):
+            if r - start >= size and len(grid.above(r)) == 0:
+                bounds.append((start, r))
+                start = r
+        bounds.append((start, nrows))
+        return bounds
+
+    def _chunk(self, start, stop):
+        """A table made of rows start to stop, for rendering them on their
+        own; the rows and values are shared with this table"""
+        chunk = Table(col_format=self.col_format,
+                      memo_formats=self.memo_formats)
+        chunk.has_header = self.has_header
+        # the rows below the header rows in the chunk
+        nhead = self._header_count()
+        lo = max(start - nhead, 0)
+        hi = max(stop - nhead, 0)
+        chunk._style_masks = dict((col, (palette, codes[lo:hi])) for col,
+                                  (palette, codes) in self._style_masks.items())
+        if self._columns is None:
+            chunk.rows = self.rows[start:stop]
+            return chunk
+        head = self.rows._head
+        chunk._columns = [col[lo:hi] for col in self._columns]
+        chunk._nrows = hi - lo
+        chunk._sparse = dict((r - lo, cells) for r, cells in
+                             self._sparse.items() if lo <= r < hi)
+        chunk.rows = _ColumnarRows(chunk, head[start:stop])
+        return chunk
+
+    def page(self, n, size):
+        """Show page n, counting from 0, of the rows of the table
+
+        Each page has size rows apart from the header rows, which are shown on
+        every page.  Only the rows of the page are rendered.  The returned
+        object displays as HTML in the notebook."""
+        return _TablePage(self, n, size)
+
+    def live(self):
+        """An object for showing the table in the notebook and then updating
+        what is shown as the table changes, sending only the rows that
+        changed::
+
+            live = table.live()
+            live.show()
+            table.cell(3, 1).value = 42
+            live.update()
+
+        The table keeps track of the rows changed through its cells and rows
+        from then on, and only those are rendered again, so an update costs
+        in proportion to the changes rather than to the table.  The rows are
+        replaced in the page by a short script, which needs a notebook that
+        runs the JavaScript of trusted outputs.  Changes that move rows or
+        restyle them, such as changes of spans, adding rows or style_where,
+        send the whole table again, as does a change to ``cells`` made by
+        assigning to its items.  The table is shown in full, without
+        max_rows.  IPython is needed for show and update; patch gives the
+        changes without it."""
+        return _LiveTable(self)
+
+    def _header_count(self):
+        "The number of header rows at the top of the table"
+        if self._streamed():
+            return len(self.rows._head)
+        count = 0
+        for row in self.rows:
+            if not isinstance(row, TableHeaderRow):
+                break
+            count += 1
+        return count
+
+    def _owners(self, r):
+        "The (row, column) owning each slot of row r"
+        owners = self._grid().owners[r]
+        if owners is None:
+            owners = [(r, c) for c in range(self.rows[r].column_count())]
+        return owners
+
+    def _clipped_cells(self, indices, cols=None):
+        """Generate the cells shown in the rows with the given indices and,
+        if cols is given, the columns with those indices
+
+        Spans are clipped to these rows and columns: a cell is shown with the
+        part of its span that falls within them, and at the top if it starts
+        in a row above them.  No other rows are formatted.  Each row is a list
+        of (cell, formatter, row_span, col_span, col_style), where cell is
+        None for the columns a cell shown further up reaches into."""
+        indices = list(indices)
+        owners = [self._owners(r) for r in indices]
+        if cols is not None:
+            owners = [[row_owners[c] for c in cols] for row_owners in owners]
+        formatters = self._formatters()
+        styler = self._styler()
+        # cells, formats and column styles of the rows holding the cells shown
+        rows = {}
+        for i, row_owners in enumerate(owners):
+            shown = []
+            for c, owner in enumerate(row_owners):
+                if c > 0 and row_owners[c-1] == owner:
+                    continue
+                col_span = 1
+                while row_owners[c+col_span:c+col_span+1] == [owner]:
+                    col_span += 1
+                if i > 0 and owners[i-1][c:c+1] == [owner]:
+                    shown.append((None, None, 0, col_span, None))
+                    continue
+                row_span = 1
+                while (i + row_span < len(owners) and
+                       owners[i+row_span][c:c+1] == [owner]):
+                    row_span += 1
+                r0, c0 = owner
+                if r0 not in rows:
+                    row = self.rows[r0]
+                    rows[r0] = (row._render_cells(),
+                                row._cell_formatters(formatters),
+                                styler(r0) if styler else None)
+                cells, cell_formatters, col_styles = rows[r0]
+                formatter = (cell_formatters[c0] if cell_formatters
+                             else _default_format)
+                shown.append((cells[c0], formatter, row_span, col_span,
+                              col_styles and col_styles[c0]))
+            yield shown
+
+    def _clipped_html(self, indices, styles, cols=None):
+        """Generate the HTML for the rows with the given indices, adding the
+        styles used to styles; see _clipped_cells"""
+        for shown in self._clipped_cells(indices, cols):
+            parts = ['<tr>']
+            for cell, formatter, row_span, col_span, col_style in shown:
+                if cell is not None:
+                    parts.append(cell._html(formatter, row_span, col_span,
+                                            styles, col_style))
+            parts.append('</tr>')
+            yield ''.join(parts)
+
+    def _clipped_latex(self, indices, cols=None):
+        """Generate the LaTeX for the rows with the given indices; see
+        _clipped_cells.  Header rows end with a rule, as in _render_latex."""
+        indices = list(indices)
+        for r, shown in zip(indices, self._clipped_cells(indices, cols)):
+            parts = []
+            for cell, formatter, row_span, col_span, col_style in shown:
+                if cell is not None:
+                    parts.append(cell._latex(formatter, row_span, col_span))
+                elif col_span > 1:
+                    parts.append('\\multicolumn{%d}{l}{}' % col_span)
+                else:
+                    parts.append('')
+            latex = ' & '.join(parts) + '\\\\'
+            if isinstance(self.rows[r], TableHeaderRow):
+                latex += '\\\nhline'
+            yield latex
+
+    def _summary_html(self, text):
+        "A row spanning the whole table saying something about it"
+        cell = TableCell(text, col_span=self.column_count())
+        return '<tr>' + cell._html(_default_format) + '</tr>'
+
+    def write_html(self, fp):
+        """Write the HTML for the table to the file-like object fp
+
+        Rows are written one at a time as they are rendered."""
+        for chunk in self.iter_html():
+            fp.write(chunk)
+
+    def _repr_html_(self):
+        if self._streamed():
+            # the rows can only be gone through once, which is left to
+            # write_html and the like rather than to whichever of the
+            # notebook's formatters runs first
+            return None
+        return ''.join(self._iter_html(self.max_rows, True))
+
+    def iter_latex(self, environment='tabular'):
+        """Generate the LaTeX for the table in chunks
+
+        environment is either 'tabular' or 'longtable'.  A longtable may break
+        across pages and repeats the header rows at the top of every page; it
+        needs ``\\usepackage{longtable}`` in the .tex file.  The preamble, each
+        row and the closing lines are yielded as separate strings, so a large
+        table never has to be held in memory as a whole, and the rows are
+        not kept for later renders."""
+        return self._iter_latex(environment, False)
+
+    def _iter_latex(self, environment, keep):
+        "iter_latex, keeping the rendered rows for later renders if keep"
+        return self._wrap_latex(self._rows_latex(keep), environment)
+
+    def _rows_latex(self, keep=False):
+        "Generate the LaTeX of each row; see TableRow._render_html for keep"
+        layout = self._layout()
+        self._format_block = None
+        formatters = self._formatters()
+        for row, above, cur in layout:
+            yield row._render_latex(above, cur, formatters, keep)
+
+    def _wrap_latex(self, rows_latex, environment, ncols=None):
+        """Generate the LaTeX for the table from the LaTeX of its rows, which
+        have ncols columns if that is not the number the table has"""
+        if environment not in ('tabular', 'longtable'):
+            raise ValueError('Unknown LaTeX environment: %r' % environment)
+        hline = r'\hline' + '\n' if self.has_header else ''
+        if ncols is None:
+            ncols = self.column_count()
+        yield '\\begin{%s}{*{%d}{l}}\n' % (environment, ncols)
         # Top horizontal line of table
-        latex += r'\hline' + '\n' if self.has_header else ''
-        above = []
+        yield hline
+        # Leading header rows are kept so that a longtable can repeat them
+        nhead = self._header_count() if environment == 'longtable' else 0
+        head = []
         # Fill table contents
-        for row in self.rows:
-            row._above = above
-            latex += row._repr_latex_() + '\n'
-            above = row._current
+        for r, latex in enumerate(rows_latex):
+            latex += '\n'
+            if r < nhead:
+                head.append(latex)
+            elif r == nhead and head:
+                yield (r'\endfirsthead' + '\n' + hline + ''.join(head)
+                       + r'\endhead' + '\n')
+            yield latex
         #Bottom horizontal line of table
-        latex += r'\hline' + '\n' if self.has_header else ''
+        yield hline
         # Finish table
-        latex += r'\end{tabular}'
-        return latex
+        yield '\\end{%s}' % environment
+
+    def write_latex(self, fp, environment='tabular'):
+        """Write the LaTeX for the table to the file-like object fp
+
+        Rows are written one at a time as they are rendered; see
+        ``iter_latex`` for the supported environments."""
+        for chunk in self.iter_latex(environment):
+            fp.write(chunk)
+
+    def _repr_latex_(self):
+        if self._streamed():
+            # see _repr_html_
+            return None
+        return ''.join(self._iter_latex('tabular', True))
+
+    def _text_rows(self, max_rows, sep, markdown):
+        """The rows of the table as lists of (text, number of columns) and
+        the width of each column, for plain text and Markdown
+
+        Each value is formatted once; the widths are worked out as the rows
+        are formatted and the formatted rows kept for writing them out.  A
+        row of None stands for rows left out because of max_rows, as in
+        iter_html.  For Markdown, which has no spans, the text of a cell is
+        put in the first of its columns and '|' is escaped."""
+        nhead = self._header_count()
+        skipped = 0
+        if max_rows is not None and self._streamed():
+            raise ValueError('max_rows is not supported for tables made with '
+                             'Table.from_iter')
+        if max_rows is not None and len(self.rows) - nhead > max_rows:
+            tail = max_rows // 2
+            head = nhead + max_rows - tail
+            nrows = len(self.rows)
+            skipped = nrows - head - tail
+            # spans are clipped to the rows shown, as in iter_html
+            row_texts = chain(self._clipped_texts(range(head)), [None],
+                              self._clipped_texts(range(nrows - tail, nrows)))
+        else:
+            formatters = self._formatters()
+            row_texts = (row._texts(above, cur, formatters)
+                         for row, above, cur in self._layout())
+        self._format_block = None
+        widths = []
+        # cells spanning columns, which are fitted in once all widths are known
+        spanning = []
+        rows = []
+        for item in row_texts:
+            if item is None:
+                rows.append(None)
+                continue
+            texts = [(_one_line(text), span) for text, span, _ in item]
+            if markdown:
+                texts = [(text.replace('|', '\\|') if i == 0 else '', 1)
+                         for text, span in texts for i in range(span)]
+            col = 0
+            for text, span in texts:
+                if len(widths) < col + span:
+                    widths.extend([0] * (col + span - len(widths)))
+                if span == 1:
+                    widths[col] = max(widths[col], len(text))
+                else:
+                    spanning.append((col, span, len(text)))
+                col += span
+            rows.append(texts)
+        for col, span, length in spanning:
+            width = sum(widths[col:col+span]) + len(sep) * (span - 1)
+            if length > width:
+                widths[col+span-1] += length - width
+        return rows, widths, nhead, skipped
+
+    def _clipped_texts(self, indices):
+        """Generate the rows with the given indices as TableRow._texts gives
+        them, with the spans clipped to those rows; see _clipped_cells"""
+        for shown in self._clipped_cells(indices):
+            yield [('', col_span, 0) if cell is None else
+                   (cell._formatted(formatter), col_span, row_span)
+                   for cell, formatter, row_span, col_span, col_style in shown]
+
+    def iter_text(self, max_rows=None):
+        """Generate the table as plain text, a line at a time
+
+        Columns are left aligned, as in the LaTeX of the table, and separated
+        by two spaces; a cell spanning columns takes up all of them, and a
+        cell from a row above is left blank.  The header rows at the top are
+        underlined.  max_rows is as for iter_html."""
+        sep = '  '
+        rows, widths, nhead, skipped = self._text_rows(max_rows, sep, False)
+        for r, texts in enumerate(rows):
+            if texts is None:
+                yield u'\u22ee %d rows not shown\n' % skipped
+                continue
+            yield _text_line(texts, widths, sep).rstrip() + '\n'
+            if r == nhead - 1:
+                yield sep.join('-' * width for width in widths) + '\n'
+
+    def to_text(self, max_rows=None):
+        "The table as plain text; see iter_text"
+        return ''.join(self.iter_text(max_rows))
+
+    def write_text(self, fp, max_rows=None):
+        "Write the table as plain text to the file-like object fp"
+        for line in self.iter_text(max_rows):
+            fp.write(line)
+
+    def iter_markdown(self, max_rows=None):
+        """Generate the table as a Markdown (pipe) table, a line at a time
+
+        The first header row, or an empty row if there is none, is the
+        header of the Markdown table.  Markdown has no spans: the value of a
+        spanning cell is shown in its first column.  max_rows is as for
+        iter_html."""
+        sep = ' | '
+        rows, widths, nhead, skipped = self._text_rows(max_rows, sep, True)
+        # the line under the header needs at least three dashes
+        widths = [max(width, 3) for width in widths]
+        if nhead == 0:
+            rows.insert(0, [('', 1)] * len(widths))
+        for r, texts in enumerate(rows):
+            if texts is None:
+                texts = [(u'\u22ee %d rows not shown' % skipped, 1)]
+                texts.extend([('', 1)] * (len(widths) - 1))
+            yield '| ' + _text_line(texts, widths, sep) + ' |\n'
+            if r == 0:
+                yield '|' + '|'.join('-' * (width + 2)
+                                     for width in widths) + '|\n'
+
+    def to_markdown(self, max_rows=None):
+        "The table as Markdown; see iter_markdown"
+        return ''.join(self.iter_markdown(max_rows))
+
+    def write_markdown(self, fp, max_rows=None):
+        "Write the table as Markdown to the file-like object fp"
+        for line in self.iter_markdown(max_rows):
+            fp.write(line)
+
+    def _slot_rows(self, spans):
+        """Generate the formatted values of each row, one for each column
+
+        spans says what goes in the columns a cell spans into: 'repeat' its
+        value, 'blank' '' and 'annotate' None, with the cell itself given as
+        a dict with its value, row_span and col_span if it spans more than
+        one column or row."""
+        if spans not in ('repeat', 'blank', 'annotate'):
+            raise ValueError('Unknown way of showing spans: %r' % spans)
+        layout = self._layout()
+        self._format_block = None
+        formatters = self._formatters()
+        slots_above = []
+        for row, above, cur in layout:
+            slots = []
+            for text, ncols, nrows in row._texts(above, cur, formatters):
+                col = len(slots)
+                if nrows == 0:
+                    # a cell from a row above
+                    if spans == 'repeat':
+                        slots.extend(slots_above[col:col+ncols])
+                    else:
+                        slots.extend([None if spans == 'annotate' else ''] *
+                                     ncols)
+                elif spans == 'repeat':
+                    slots.extend([text] * ncols)
+                elif spans == 'blank':
+                    slots.append(text)
+                    slots.extend([''] * (ncols - 1))
+                elif ncols > 1 or nrows > 1:
+                    slots.append({'value': text, 'row_span': nrows,
+                                  'col_span': ncols})
+                    slots.extend([None] * (ncols - 1))
+                else:
+                    slots.append(text)
+            slots_above = slots
+            yield slots
+
+    def to_csv(self, fp=None, spans='repeat', **fmtparams):
+        """Write the table, formatted as in its HTML, as CSV to the
+        file-like object fp, or return it as a string if fp is None
+
+        The rows are written with ``csv.writer`` as they are formatted; the
+        keyword arguments are passed on to it, for instance delimiter='\\t'
+        for TSV.  A cell spanning columns or rows has its value repeated in
+        all of them, or with spans='blank' only in the first."""
+        if fp is None:
+            # the csv module of Python 2 writes bytes
+            out = io.StringIO() if PY3 else io.BytesIO()
+            self.to_csv(out, spans, **fmtparams)
+            return out.getvalue()
+        writer = csv.writer(fp, **fmtparams)
+        for slots in self._slot_rows(spans):
+            writer.writerow(slots)
+
+    def to_json(self, fp=None, spans='annotate'):
+        """Write the table, formatted as in its HTML, as JSON to the
+        file-like object fp, or return it as a string if fp is None
+
+        The JSON is an object with the header rows at the top of the table as
+        "header" and the other rows as "rows", each row a list with the
+        formatted value of each column.  A cell spanning columns or rows is
+        an object with its "value", "row_span" and "col_span", and the
+        columns it spans into are null; spans='repeat' or 'blank' show
+        spans as to_csv does instead.  Each row is encoded and written as it
+        is formatted."""
+        if fp is None:
+            out = io.StringIO()
+            self.to_json(out, spans)
+            return out.getvalue()
+        encode = json.JSONEncoder(ensure_ascii=False, sort_keys=True).encode
+        nhead = self._header_count()
+        fp.write(u'{"header": [')
+        r = -1
+        for r, slots in enumerate(self._slot_rows(spans)):
+            if r < nhead:
+                fp.write((u', ' if r else u'') + encode(slots))
+                continue
+            fp.write(u'],\n "rows": [\n  ' if r == nhead else u',\n  ')
+            fp.write(encode(slots))
+        if r < nhead:
+            fp.write(u'],\n "rows": [')
+        fp.write(u'\n]}\n')
+
+    def _repr_pretty_(self, p, cycle):
+        "Show the table as plain text in the IPython console"
+        if self._streamed():
+            # see _repr_html_
+            p.text(repr(self))
+            return
+        p.text(self.to_text(self.max_rows).rstrip('\n'))
+
+class Profile(object):
+    """The time taken by each phase of building and rendering tables, as
+    collected by ``profile``
+
+    The phases are 'construct' (Table, its from_* constructors and concat),
+    'spans' (working out the spans of a row), 'format' (formatting values),
+    'escape' (HTML and LaTeX escaping) and 'html' and 'latex' (rendering
+    whole tables and views, including the other phases they run)."""
+    def __init__(self):
+        # phase -> [seconds, calls, cells]
+        self.phases = {}
+
+    def _add(self, phase, seconds, cells):
+        totals = self.phases.get(phase)
+        if totals is None:
+            totals = self.phases[phase] = [0.0, 0, 0]
+        totals[0] += seconds
+        totals[1] += 1
+        totals[2] += cells
+
+    def report(self):
+        """The totals of each phase as a dict of phase to a dict with the
+        'seconds' taken, the number of 'calls', the number of 'cells' gone
+        through and 'cells_per_second', which is None if no time was
+        measured"""
+        return dict((phase, {'seconds': seconds, 'calls': calls,
+                             'cells': cells,
+                             'cells_per_second': cells / seconds
+                             if seconds else None})
+                    for phase, (seconds, calls, cells) in self.phases.items())
 
+    def __str__(self):
+        lines = ['%-10s %10s %8s %10s %12s' % ('phase', 'seconds', 'calls',
+                                                'cells', 'cells/s')]
+        for phase, totals in sorted(self.report().items()):
+            rate = totals['cells_per_second']
+            lines.append('%-10s %10.4f %8d %10d %12s' % (
+                phase, totals['seconds'], totals['calls'], totals['cells'],
+                '' if rate is None else '%.0f' % rate))
+        return '\n'.join(lines)
+
+def _table_cells(table):
+    "The number of slots of a table, or 0 for one made with Table.from_iter"
+    if table._streamed():
+        return 0
+    return len(table.rows) * table.column_count()
+
+# (owner, name, phase, cells) of the functions and methods timed by profile,
+# where cells(args, result) is the number of cells a call went through.  The
+# html and latex phases are generators, timed as they are gone through.
+_PROFILED = [
+    (Table, '__init__', 'construct', lambda args, result:
+     _table_cells(args[0])),
+    (Table, 'from_columns', 'construct', lambda args, result:
+     _table_cells(result)),
+    (Table, 'from_iter', 'construct', lambda args, result: 0),
+    (Table, 'concat', 'construct', lambda args, result:
+     _table_cells(result)),
+    (TableRow, '_spans', 'spans', lambda args, result:
+     args[0].column_count()),
+    (TableCell, '_formatted', 'format', lambda args, result: 1),
+    (sys.modules[__name__], '_format_values', 'format', lambda args, result:
+     len(result)),
+    (sys.modules[__name__], '_html_escape', 'escape', lambda args, result:
+     1),
+    (sys.modules[__name__], '_html_escape_values', 'escape',
+     lambda args, result: len(result)),
+    (sys.modules[__name__], '_latex_escape', 'escape', lambda args, result:
+     1),
+    (sys.modules[__name__], '_latex_escape_values', 'escape',
+     lambda args, result: len(result)),
+    (Table, '_iter_html', 'html', lambda args, result:
+     _table_cells(args[0])),
+    (Table, '_iter_latex', 'latex', lambda args, result:
+     _table_cells(args[0])),
+    (_TableView, 'iter_html', 'html', lambda args, result:
+     len(args[0]) * args[0]._ncols()),
+    (_TableView, 'iter_latex', 'latex', lambda args, result:
+     len(args[0]) * args[0]._ncols()),
+]
+
+# the profiles being collected, and the functions and methods replaced while
+# there are any
+_profiles = []
+_unprofiled = []
+# phases being timed in each thread, so that calls within them are not
+# counted again
+_timing = threading.local()
+# totals are added to from any thread
+_recording = threading.Lock()
+
+def _timing_phases():
+    "The set of phases being timed in this thread"
+    phases = getattr(_timing, 'phases', None)
+    if phases is None:
+        phases = _timing.phases = set()
+    return phases
+
+def _record(phase, seconds, cells):
+    with _recording:
+        for p in _profiles:
+            p._add(phase, seconds, cells)
+
+def _timed(func, phase, cells):
+    "func, recording the time taken by its calls as phase"
+    @wraps(func)
+    def timed(*args, **kwargs):
+        timing = _timing_phases()
+        if phase in timing:
+            return func(*args, **kwargs)
+        timing.add(phase)
+        start = default_timer()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            seconds = default_timer() - start
+            timing.discard(phase)
+        _record(phase, seconds, cells(args, result))
+        return result
+    return timed
+
+def _timed_iter(func, phase, cells):
+    """The generator function func, recording the time taken to go through
+    what it generates as phase"""
+    @wraps(func)
+    def timed(*args, **kwargs):
+        items = func(*args, **kwargs)
+        seconds = 0.0
+        try:
+            while True:
+                start = default_timer()
+                try:
+                    item = next(items)
+                except StopIteration:
+                    break
+                finally:
+                    seconds += default_timer() - start
+                yield item
+        finally:
+            _record(phase, seconds, cells(args, None))
+    return timed
+
+@contextmanager
+def profile():
+    """Collect the time taken by each phase of building and rendering tables
+    in the block, as a Profile::
+
+        with tabipy.profile() as p:
+            html = table._repr_html_()
+        print(p)
+        metrics = p.report()
+
+    The functions involved are only replaced by timed versions while a
+    profile is being collected, so this costs nothing otherwise.  Tables
+    built and rendered in other threads at the same time are counted too,
+    while work done in other processes by ``render_html(workers=...)`` is
+    not.  Timing the calls adds to the time they take, the per-cell phases
+    especially."""
+    p = Profile()
+    if not _profiles:
+        for owner, name, phase, cells in _PROFILED:
+            func = vars(owner)[name]
+            _unprofiled.append((owner, name, func))
+            timer = _timed_iter if phase in ('html', 'latex') else _timed
+            if isinstance(func, classmethod):
+                timed = classmethod(timer(func.__func__, phase, cells))
+            else:
+                timed = timer(func, phase, cells)
+            setattr(owner, name, timed)
+    _profiles.append(p)
+    try:
+        yield p
+    finally:
+        _profiles.remove(p)
+        if not _profiles:
+            while _unprofiled:
+                owner, name, func = _unprofiled.pop()
+                setattr(owner, name, func)
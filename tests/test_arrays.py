@@ -0,0 +1,46 @@
+import pytest
+from tabipy import Table, TableHeaderRow, _format_values, _compile_format
+
+np = pytest.importorskip('numpy')
+
+def test_format_values():
+    ints = np.array([1, -20, 300])
+    floats = np.array([1.5, -2.25, 1e10, np.nan])
+    for values in (ints, floats, floats.astype(np.float32)):
+        for fmt in ('{:.2f}', '{:10.4g}', '{:+e}', '{:08.3f}', '{}',
+                    '{:>6}', '{:,.1f}'):
+            expected = [fmt.format(v) for v in values]
+            assert _format_values(values, _compile_format(fmt)) == expected
+    assert _format_values(ints, _compile_format('{:d}')) == ['1', '-20', '300']
+    with pytest.raises(ValueError):
+        _format_values(floats, _compile_format('{:d}'))
+
+def test_from_array():
+    array = np.arange(12, dtype=float).reshape(4, 3) / 4
+    col_format = ('{:.2f}', '{:g}', '{}')
+    t = Table.from_array(array, headers=('a', 'b', 'c'), col_format=col_format)
+    expected = Table(TableHeaderRow('a', 'b', 'c'), *array.tolist(),
+                     col_format=col_format)
+    assert t._repr_html_() == expected._repr_html_()
+    assert t._repr_latex_() == expected._repr_latex_()
+    # the table shares the array's memory
+    array[0, 0] = 99
+    assert '99.00' in t._repr_html_()
+
+def test_from_dataframe():
+    pd = pytest.importorskip('pandas')
+    df = pd.DataFrame({'x': [1, 2, 3], 'y': ['a', 'b', 'c']},
+                      index=pd.Index([10, 20, 30], name='i'))
+    t = Table.from_dataframe(df, index=True)
+    expected = Table(TableHeaderRow('i', 'x', 'y'),
+                     (10, 1, 'a'), (20, 2, 'b'), (30, 3, 'c'))
+    assert t._repr_html_() == expected._repr_html_()
+    t = Table.from_dataframe(df, col_format=('{:03d}', '{}'))
+    assert '>003<' in t._repr_html_()
+
+def test_from_dataframe_duplicate_names():
+    pd = pytest.importorskip('pandas')
+    df = pd.DataFrame([[1, 2], [3, 4]], columns=['x', 'x'])
+    t = Table.from_dataframe(df)
+    expected = Table(TableHeaderRow('x', 'x'), (1, 2), (3, 4))
+    assert t._repr_html_() == expected._repr_html_()
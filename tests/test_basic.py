@@ -213,3 +213,45 @@ def test_cell_method_col_span_latex():
     parts = col_split.split(lines[0])
     cl_check = re.compile('\w*\\multicolumn\s*\{\s*2\s*}')
     assert len(cl_check.findall(parts[0]))>0
+
+def test_slots():
+    for obj in (TableCell(1), TableHeader('a'), TableRow(1, 2),
+                TableHeaderRow('a', 'b')):
+        assert not hasattr(obj, '__dict__')
+    with pytest.raises(ValueError):
+        TableCell(1).row_span = 0
+
+def test_escape_regex_shared():
+    TableCell('&')._repr_latex_()
+    assert TableCell._latex_escape_re is not None
+    assert TableHeader._latex_escape_re is TableCell._latex_escape_re
+
+def test_html_escape():
+    cell = TableCell('<b>R&D</b>')
+    assert cell._repr_html_() == '<td  >&lt;b&gt;R&amp;D&lt;/b&gt;</td>'
+    header = TableHeader('a < b', col_span=2)
+    assert header._repr_html_() == '<th colspan="2"  >a &lt; b</th>'
+    t = Table.from_columns([['x&y', 'plain'], [1, 2]])
+    assert '<td  >x&amp;y</td>' in t._repr_html_()
+
+def test_html_tags_shared():
+    from tabipy import _html_tags, Style
+    TableCell(1, bg_colour='red')._repr_html_()
+    key = (False, 1, 1, Style('red'), False)
+    tags = _html_tags[key]
+    TableCell(2, bg_colour='red')._repr_html_()
+    assert _html_tags[key] is tags
+    assert tags == ('<td  style="background-color:red">', '</td>')
+
+def test_cell_repr():
+    assert repr(TableCell('x')) == "TableCell('x')"
+    assert (repr(TableCell(1.5, header=True, bg_colour='red', col_span=2)) ==
+            'TableCell(1.5, header=True, bg_colour=red, col_span=2)')
+
+def test_row_and_table_repr():
+    t = Table(TableHeaderRow('a', 'b', 'c'), *[(i, i, i) for i in range(10000)])
+    assert repr(t) == '<Table: 10001 rows x 3 columns, 1 header row>'
+    assert repr(t.rows[0]) == '<TableHeaderRow: 3 cells, 3 columns>'
+    assert repr(TableRow(TableCell(1, col_span=2))) == \
+        '<TableRow: 2 cells, 2 columns>'
+    assert len(repr(t.rows)) < 40 * len(t.rows)
@@ -0,0 +1,64 @@
+import pytest
+from tabipy import Table, TableHeaderRow, TableCell
+
+def both_tables():
+    rows = ((1, 2.5, 'a'),
+            (3, 4.25, 'b'),
+            (5, 6.0, 'c'))
+    col_format = ('{:d}', '{:.1f}', '{}')
+    by_row = Table(TableHeaderRow('x', 'y', 'z'), *rows, col_format=col_format)
+    by_col = Table.from_columns(list(zip(*rows)), header=('x', 'y', 'z'),
+                                col_format=col_format)
+    return by_row, by_col
+
+def test_same_output_as_rows():
+    by_row, by_col = both_tables()
+    assert len(by_col.rows) == 4
+    assert by_col.has_header
+    assert by_col._repr_html_() == by_row._repr_html_()
+    assert by_col._repr_latex_() == by_row._repr_latex_()
+
+def test_cells_materialised_on_access():
+    by_row, by_col = both_tables()
+    assert by_col._sparse == {}
+    cell = by_col.cell(2, 1)
+    assert cell.value == 4.25
+    assert by_col.cell(2, 1) is cell
+    assert list(by_col._sparse) == [1]
+    for t in (by_row, by_col):
+        t.cell(1, 0).row_span = 2
+        t.cell(2, 1).bg_colour = 'red'
+        t.cell(3, 2).value = 'q'
+    assert by_col._repr_html_() == by_row._repr_html_()
+    assert by_col._repr_latex_() == by_row._repr_latex_()
+
+def test_append_row():
+    by_row, by_col = both_tables()
+    for t in (by_row, by_col):
+        t.append_row((7, TableCell(8.0, col_span=2)))
+    assert len(by_col.rows) == 5
+    assert by_col._repr_html_() == by_row._repr_html_()
+
+def test_mapping_and_ragged_columns():
+    t = Table.from_columns({'a': [1, 2, 3], 'b': ['x', 'y']})
+    assert t._repr_html_() == Table({'a': [1, 2, 3],
+                                     'b': ['x', 'y']})._repr_html_()
+
+def test_negative_and_out_of_range_columns():
+    t = Table.from_columns([[1, 2], [3, 4]])
+    t.cell(1, -1).value = 'X'
+    assert t.cell(1, 1).value == 'X'
+    assert '<td  >X</td>' in t._repr_html_()
+    assert t.rows[0].cells[-2] is t.cell(0, 0)
+    with pytest.raises(IndexError):
+        t.cell(0, 2)
+    with pytest.raises(IndexError):
+        t.cell(0, -3)
+    assert t._sparse == {0: {0: t.cell(0, 0)}, 1: {1: t.cell(1, 1)}}
+
+def test_row_format_not_settable():
+    t = Table.from_columns([[1, 2], [3, 4]])
+    with pytest.raises(TypeError):
+        t.rows[1].row_format = ['{}', '[{}]']
+    assert t.rows[1].row_format is None
+    assert '[' not in t._repr_html_()
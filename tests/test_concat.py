@@ -0,0 +1,108 @@
+import copy
+import pickle
+import pytest
+from tabipy import Table, TableHeaderRow
+
+def segment(start, n=2):
+    return Table(TableHeaderRow('a', 'b'),
+                 *[(i, i * 10) for i in range(start, start + n)])
+
+def test_concat_rows_shares_rows():
+    first, second = segment(0), segment(2)
+    t = Table.concat([first, second])
+    assert len(t.rows) == 5
+    assert t.has_header
+    assert t.rows[1] is first.rows[1]
+    assert t.rows[3] is second.rows[1]
+    assert t._repr_html_() == Table(TableHeaderRow('a', 'b'),
+                                    *[(i, i * 10) for i in range(4)]
+                                    )._repr_html_()
+
+def test_concat_rows_sees_span_changes():
+    first = segment(0)
+    t = Table.concat([first, segment(2)])
+    t._repr_html_()
+    first.cell(1, 0).row_span = 2
+    assert '<td rowspan="2" >0</td>' in t._repr_html_()
+    assert t.cell(2, 0, owner=True) is first.cell(1, 0)
+
+def test_concat_rows_checks_columns_and_formats():
+    with pytest.raises(ValueError):
+        Table.concat([segment(0), Table((1, 2, 3))])
+    formatted = Table((1, 2), col_format=('{:02d}', '{}'))
+    with pytest.raises(ValueError):
+        Table.concat([segment(0), formatted])
+    t = Table.concat([formatted, Table((3, 4), col_format=['{:02d}', '{}'])])
+    assert '<td  >03</td>' in t._repr_html_()
+
+def test_concat_rows_missing_format_is_default():
+    t = Table.concat([Table((1, 2)), Table((3, 4), col_format=['{}', '{}'])])
+    assert t.to_text() == Table((1, 2), (3, 4)).to_text()
+
+def test_concat_columnar_rows_pickle():
+    first = Table.from_columns([[1, 2], [3, 4]], header=['x', 'y'])
+    first.cell(1, 0).row_span = 2
+    t = Table.concat([first, Table.from_columns([[5], [6]]), Table((7, 8))])
+    html, latex = t._repr_html_(), t._repr_latex_()
+    assert pickle.loads(pickle.dumps(t))._repr_html_() == html
+    assert copy.deepcopy(t)._repr_latex_() == latex
+    assert t.render_html(workers=2) == t.render_html()
+    assert t.render_latex(workers=2) == t.render_latex()
+    # pickling makes no cells in the tables
+    assert list(first._sparse) == [0]
+
+def test_concat_columnar_rows():
+    first = Table.from_columns([[1, 2], [3, 4]], header=['x', 'y'])
+    t = Table.concat([first, Table.from_columns([[5], [6]])])
+    assert t.to_text() == 'x  y\n-  -\n1  3\n2  4\n5  6\n'
+
+def test_concat_side_by_side():
+    left = segment(0)
+    left.cell(1, 0).row_span = 2
+    right = Table((7,), (8,), col_format=('{:.1f}',))
+    t = Table.concat([left, right], axis=1)
+    assert t.column_count() == 3
+    assert t.col_format == ['{}', '{}', '{:.1f}']
+    assert t._repr_html_() == (
+        '<table>\n'
+        '<tr><th  >a</th><th  >b</th><th  ></th></tr>\n'
+        '<tr><td rowspan="2" >0</td><td  >0</td><td  >7.0</td></tr>\n'
+        '<tr><td  >10</td><td  >8.0</td></tr>\n'
+        '</table>')
+    left.cell(1, 1).value = 'new'
+    assert '<td  >new</td>' in t._repr_html_()
+    with pytest.raises(ValueError):
+        Table.concat([left, Table((1,))], axis=1)
+
+def test_concat_side_by_side_columnar_shares_columns():
+    first = Table.from_columns([[1, 2], [3, 4]], header=['x', 'y'])
+    second = Table.from_columns([[5, 6]], header=['z'])
+    t = Table.concat([first, second], axis=1)
+    assert t._columns[2] is second._columns[0]
+    assert t.to_text() == 'x  y  z\n-  -  -\n1  3  5\n2  4  6\n'
+    t.append_row((0, 0, 0))
+    first.append_row((9, 9))
+    assert first._columns == [[1, 2, 9], [3, 4, 9]]
+    assert t._columns == [[1, 2, 0], [3, 4, 0], [5, 6, 0]]
+
+def test_concat_side_by_side_pickles():
+    t = Table.concat([segment(0), Table((7,), (8,))], axis=1)
+    assert pickle.loads(pickle.dumps(t))._repr_html_() == t._repr_html_()
+
+def test_concat_many_segments():
+    segments = [segment(i * 2) for i in range(200)]
+    t = Table.concat(segments)
+    assert len(t.rows) == 401
+    assert t.rows[-1] is segments[-1].rows[-1]
+
+def test_concat_side_by_side_columnar_shares_cells():
+    first = Table.from_columns([[1, 2], [3, 4]], header=['x', 'y'])
+    second = Table.from_columns([[5, 6]], header=['z'])
+    t = Table.concat([first, second], axis=1)
+    first.cell(1, 0).value = 'X'
+    t.cell(2, 2).value = 'Y'
+    assert t.to_text() == 'x  y  z\n-  -  -\nX  3  5\n2  4  Y\n'
+    assert second.cell(2, 0) is t.cell(2, 2)
+    assert 'Y' in second.to_text()
+    t.cell(1, 1).row_span = 2
+    assert '<td rowspan="2" >3</td>' in first._repr_html_()
@@ -0,0 +1,52 @@
+import csv
+import io
+import json
+import pytest
+from tabipy import Table, TableCell, TableHeaderRow, TableRow
+
+def span_table():
+    return Table(TableHeaderRow('A', 'B', 'C'),
+                 TableRow(TableCell(1.234, format='{:.1f}'), 2.5, 3,
+                          format=('{}', '{:.2f}', '{:03d}')),
+                 (TableCell('x', row_span=2, col_span=2), 4.125),
+                 (5, 6, 7),
+                 col_format=('{}', '{:.1f}', '{}'))
+
+def test_csv_formats_and_spans():
+    rows = list(csv.reader(io.StringIO(span_table().to_csv())))
+    assert rows == [['A', 'B', 'C'],
+                    ['1.2', '2.50', '003'],
+                    ['x', 'x', '4.125'],
+                    ['x', 'x', '7']]
+
+def test_csv_blank_spans_and_tsv():
+    out = io.StringIO()
+    span_table().to_csv(out, spans='blank', delimiter='\t')
+    rows = list(csv.reader(io.StringIO(out.getvalue()), delimiter='\t'))
+    assert rows[2:] == [['x', '', '4.125'], ['', '', '7']]
+
+def test_json():
+    data = json.loads(span_table().to_json())
+    assert data == {
+        'header': [['A', 'B', 'C']],
+        'rows': [['1.2', '2.50', '003'],
+                 [{'value': 'x', 'row_span': 2, 'col_span': 2}, None,
+                  '4.125'],
+                 [None, None, '7']]}
+
+def test_json_edge_cases():
+    assert json.loads(Table().to_json()) == {'header': [], 'rows': []}
+    header_only = Table(TableHeaderRow('a'))
+    assert json.loads(header_only.to_json()) == {'header': [['a']],
+                                                 'rows': []}
+    assert json.loads(Table((1, 2)).to_json(spans='repeat')) == {
+        'header': [], 'rows': [['1', '2']]}
+    with pytest.raises(ValueError):
+        Table((1, 2)).to_json(spans='merge')
+
+def test_streamed_columnar():
+    rows = [(i, i / 4.0) for i in range(2000)]
+    expected = Table(TableHeaderRow('i', 'x'), *rows).to_csv()
+    columnar = Table.from_columns(list(zip(*rows)), header=('i', 'x'))
+    assert columnar.to_csv() == expected
+    assert Table.from_iter(rows, header=('i', 'x')).to_csv() == expected
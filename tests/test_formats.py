@@ -0,0 +1,50 @@
+from tabipy import (Table, TableRow, TableCell, TableHeaderRow,
+                    _compile_format, _default_format, _memoize)
+
+def test_compile_format():
+    assert _compile_format(None) is _default_format
+    assert _compile_format('{}') is _default_format
+    assert _compile_format('{:.3g}') is _compile_format('{:.3g}')
+    for fmt in ('{:.3g}', '{0:>8.2f}', '{:d} units', '<{:x}>', '{!r}'):
+        for value in (42, 3.14159):
+            try:
+                expected = fmt.format(value)
+            except ValueError:
+                continue
+            assert _compile_format(fmt)(value) == expected
+
+def test_memoize():
+    calls = []
+    def formatter(value):
+        calls.append(value)
+        return u'{}'.format(value)
+    memo = _memoize(formatter)
+    assert [memo(v) for v in (1, 1, 1.0, True, [1])] == ['1', '1', '1.0',
+                                                         'True', '[1]']
+    # 1 and True are cached separately, 1.0 and the list are never cached
+    assert calls == [1, 1.0, True, [1]]
+
+def test_memoize_equal_numbers_formatted_apart():
+    from decimal import Decimal
+    memo = _memoize(_default_format)
+    values = [0.0, -0.0, Decimal('1.0'), Decimal('1.00'), 0j, -0j]
+    assert [memo(v) for v in values] == [_default_format(v) for v in values]
+    rows = [(0.0, Decimal('1.0')), (-0.0, Decimal('1.00'))]
+    assert (Table(*rows, memo_formats=True)._repr_html_() ==
+            Table(*rows)._repr_html_())
+
+def test_format_priority():
+    t = Table(TableHeaderRow('a', 'b'),
+              (1.2345, TableCell(2.3456, format='{:.1f}')),
+              TableRow(3.4567, 4.5678, format=('{:.3f}', '{:.4f}')),
+              col_format=('{:.2f}', '{:.2f}'))
+    html = t._repr_html_()
+    for text in ('>a<', '>1.23<', '>2.3<', '>3.457<', '>4.5678<'):
+        assert text in html
+
+def test_memo_formats_same_output():
+    rows = [('x', 1.5), ('y', 2.5)] * 10
+    t = Table(*rows, col_format=('{}', '{:.2f}'))
+    memo = Table(*rows, col_format=('{}', '{:.2f}'), memo_formats=True)
+    assert memo._repr_html_() == t._repr_html_()
+    assert memo._repr_latex_() == t._repr_latex_()
@@ -0,0 +1,68 @@
+import pytest
+from tabipy import Table, TableRow, TableCell, TableHeaderRow
+
+def rows(n):
+    for i in range(n):
+        yield (i, i * 0.5, 'r%d' % i)
+
+def test_same_as_table():
+    expected = Table(TableHeaderRow('a', 'b', 'c'), *rows(20),
+                     col_format=('{}', '{:.2f}', '{}'))
+    t = Table.from_iter(rows(20), header=('a', 'b', 'c'),
+                        col_format=('{}', '{:.2f}', '{}'))
+    assert t.render_html() == expected._repr_html_()
+    t = Table.from_iter(rows(20), header=('a', 'b', 'c'),
+                        col_format=('{}', '{:.2f}', '{}'))
+    assert t.render_latex() == expected._repr_latex_()
+
+def test_without_header_latex():
+    expected = Table(*rows(5))
+    t = Table.from_iter(rows(5))
+    assert t.render_latex() == expected._repr_latex_()
+
+def test_spans():
+    def spanned():
+        yield (TableCell(1, row_span=2), TableCell(2, col_span=2))
+        yield (3, 4)
+        yield (5, 6, 7)
+    expected = Table(*spanned())
+    assert Table.from_iter(spanned()).render_html() == expected._repr_html_()
+
+def test_rows_made_while_rendering():
+    made = []
+    def tracked():
+        for i in range(5):
+            made.append(i)
+            yield (i, i)
+    chunks = Table.from_iter(tracked()).iter_html()
+    assert next(chunks) == '<table>\n'
+    assert next(chunks).startswith('<tr>')
+    assert made == [0]
+    assert ''.join(chunks).count('<tr>') == 4
+    assert made == list(range(5))
+
+def test_rendered_once():
+    t = Table.from_iter(rows(3))
+    t.render_html()
+    with pytest.raises(RuntimeError):
+        t.render_html()
+
+def test_short_rows_padded_long_rows_rejected():
+    t = Table.from_iter([(1, 2, 3), (4,)])
+    assert t.render_html().count('<td  ></td>') == 2
+    t = Table.from_iter([(1, 2), (4, 5, 6)])
+    with pytest.raises(ValueError):
+        t.render_html()
+
+def test_append_row():
+    t = Table.from_iter(rows(3))
+    with pytest.raises(TypeError):
+        t.append_row((1, 2, 3))
+
+def test_display_leaves_rows_alone():
+    t = Table.from_iter(rows(3), header=('a', 'b', 'c'))
+    assert t._repr_html_() is None and t._repr_latex_() is None
+    formatter = pytest.importorskip('IPython.core.formatters')
+    data, metadata = formatter.DisplayFormatter().format(t)
+    assert data == {'text/plain': '<Table of rows from an iterable, 3 columns>'}
+    assert t.render_html().count('<tr>') == 4
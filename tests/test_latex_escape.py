@@ -0,0 +1,32 @@
+from tabipy import (Table, TableCell, TableHeaderRow, _latex_escape,
+                    _latex_escape_values)
+
+def regex_escape(text):
+    escape_re = (TableCell._latex_escape_re or
+                 TableCell._compile_latex_escape())
+    return escape_re.sub(TableCell._latex_escape_func, text)
+
+VALUES = [u'plain', u'R&D', u'a_b {c}', u'$5 ~ \\', u'one\r\ntwo\nthree\r',
+          u'', u'nul\x00here', u'R&D']
+
+def test_escape_matches_regex():
+    for value in VALUES:
+        assert _latex_escape(value) == regex_escape(value)
+
+def test_plain_text_returned_as_is():
+    text = u'nothing to escape here'
+    assert _latex_escape(text) is text
+    values = [u'a', u'b']
+    assert _latex_escape_values(values) is values
+
+def test_escape_values():
+    assert _latex_escape_values(VALUES) == [regex_escape(v) for v in VALUES]
+    assert _latex_escape_values([u'a\r', u'\nb']) == [regex_escape(u'a\r'),
+                                                     regex_escape(u'\nb')]
+    assert _latex_escape_values([]) == []
+
+def test_columnar_escape_matches_rows():
+    rows = [(v, i) for i, v in enumerate(VALUES)]
+    expected = Table(TableHeaderRow('text', 'n'), *rows)._repr_latex_()
+    t = Table.from_columns(list(zip(*rows)), header=('text', 'n'))
+    assert t._repr_latex_() == expected
@@ -0,0 +1,81 @@
+import pytest
+from tabipy import Table, TableHeaderRow
+
+def table():
+    return Table(TableHeaderRow('a', 'b'), (1, 2), (3, 4), (5, 6))
+
+def test_live_html_has_id():
+    t = table()
+    live = t.live()
+    html = live._repr_html_()
+    assert html.startswith('<table id="%s">\n' % live.display_id)
+    assert html.split('\n', 1)[1] == t._repr_html_().split('\n', 1)[1]
+    assert live.patch() == (None, [])
+
+def test_live_patch_changed_rows_only():
+    t = table()
+    live = t.live()
+    live._repr_html_()
+    t.cell(2, 1).value = 'x<'
+    t.rows[3].row_format = ('{}', '[{}]')
+    assert live.patch() == (None, [(2, '<tr><td  >3</td><td  >x&lt;</td></tr>'),
+                                   (3, '<tr><td  >5</td><td  >[6]</td></tr>')])
+    assert live.patch() == (None, [])
+
+def test_live_patch_columnar():
+    t = Table.from_columns([[1, 2], [3, 4]], header=['p', 'q'])
+    live = t.live()
+    live._repr_html_()
+    t.cell(2, 1).value = 9
+    assert live.patch() == (None, [(2, '<tr><td  >2</td><td  >9</td></tr>')])
+
+def test_live_sends_whole_table():
+    t = table()
+    live = t.live()
+    live._repr_html_()
+    t.cell(1, 0).row_span = 2
+    html, rows = live.patch()
+    assert 'rowspan="2"' in html and rows == []
+    t.append_row((7, 8))
+    assert live.patch()[0].count('<tr>') == 5
+    t.style_where(0, [True, False, False, False], 'blue')
+    assert 'background-color:blue' in live.patch()[0]
+    t.col_format = ('{:02d}', '{}')
+    assert '<td  >07</td>' in live.patch()[0]
+    # a new style needs the style element sent again
+    t.cell(4, 1).text_colour = 'red'
+    assert live.patch()[0] is not None
+
+def test_live_concat_sees_shared_rows():
+    t = table()
+    both = Table.concat([t, Table((7, 8))])
+    live = both.live()
+    live._repr_html_()
+    t.cell(1, 1).value = 0
+    assert live.patch() == (None, [(1, '<tr><td  >1</td><td  >0</td></tr>')])
+
+def test_live_show_and_update(monkeypatch):
+    display = pytest.importorskip('IPython.display')
+    shown = []
+    monkeypatch.setattr(display, 'display',
+                        lambda obj, display_id: shown.append((obj, display_id)))
+    monkeypatch.setattr(display, 'update_display',
+                        lambda obj, display_id: shown.append((obj, display_id)))
+    t = table()
+    live = t.live()
+    live.show()
+    assert [display_id for obj, display_id in shown] == [
+        live.display_id, live.display_id + '-update']
+    del shown[:]
+    t.cell(3, 0).value = 'new'
+    live.update()
+    [(script, display_id)] = shown
+    assert display_id == live.display_id + '-update'
+    assert '[[3, "<tr><td  >new</td><td  >6</td></tr>"]]' in script.data
+    del shown[:]
+    live.update()
+    assert shown == []
+
+def test_live_not_for_streamed_tables():
+    with pytest.raises(TypeError):
+        Table.from_iter([(1, 2)]).live()
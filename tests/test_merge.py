@@ -0,0 +1,75 @@
+import pytest
+from tabipy import Table, TableHeaderRow
+
+def report():
+    return Table(TableHeaderRow('region', 'city', 'q1', 'q2'),
+                 ('N', 'A', 1, 1),
+                 ('N', 'A', 2, 3),
+                 ('N', 'B', 4, 4),
+                 ('S', 'B', 5, 6))
+
+def test_merge_rows_nested():
+    t = report()
+    t.merge_repeats([0, 1])
+    assert [t.cell(r, 0).row_span for r in range(1, 5)] == [3, 1, 1, 1]
+    # the run of B in city is cut where the region changes
+    assert [t.cell(r, 1).row_span for r in range(1, 5)] == [2, 1, 1, 1]
+    assert t._repr_html_() == (
+        '<table>\n'
+        '<tr><th  >region</th><th  >city</th><th  >q1</th><th  >q2</th></tr>\n'
+        '<tr><td rowspan="3" >N</td><td rowspan="2" >A</td>'
+        '<td  >1</td><td  >1</td></tr>\n'
+        '<tr><td  >2</td><td  >3</td></tr>\n'
+        '<tr><td  >B</td><td  >4</td><td  >4</td></tr>\n'
+        '<tr><td  >S</td><td  >B</td><td  >5</td><td  >6</td></tr>\n'
+        '</table>')
+    latex = t._repr_latex_()
+    assert '\\multirow{3}{*}{N} & \\multirow{2}{*}{A} & 1 & 1\\\\' in latex
+    assert '\n &  & 2 & 3\\\\' in latex
+
+def test_merge_cols():
+    t = report()
+    t.merge_repeats([2, 3], axis='cols')
+    assert t.cell(1, 2).col_span == 2
+    assert t.cell(2, 2).col_span == 1
+    assert t.cell(3, 2).col_span == 2
+    assert t.column_count() == 4
+    assert '<td colspan="2"  >4</td>' in t._repr_html_()
+
+def test_merge_cols_header_and_gaps():
+    t = Table(TableHeaderRow('x', 'x', 'x', 'y'), (1, 1, 1, 1))
+    t.merge_repeats(axis='cols')
+    assert t.cell(0, 0).col_span == 3
+    assert t.cell(1, 0).col_span == 4
+    t = Table((1, 1, 1))
+    # columns 0 and 2 are not next to each other
+    t.merge_repeats([0, 2], axis='cols')
+    assert t.cell(0, 0).col_span == 1
+
+def test_merge_columnar():
+    t = Table.from_columns([['a', 'a', 'b', 'b', 'b'], [1, 2, 3, 4, 5]],
+                           header=['k', 'v'])
+    t.merge_repeats([0])
+    # only the first cell of each run is made
+    assert sorted(t._sparse) == [0, 2]
+    assert t.cell(3, 0).row_span == 3
+    assert t._repr_html_() == report_html()
+
+def report_html():
+    t = Table(TableHeaderRow('k', 'v'),
+              *[(k, v) for k, v in zip('aabbb', range(1, 6))])
+    t.cell(1, 0).row_span = 2
+    t.cell(3, 0).row_span = 3
+    return t._repr_html_()
+
+def test_merge_numpy_columns():
+    np = pytest.importorskip('numpy')
+    t = Table.from_columns([np.repeat(np.arange(3), 4), np.arange(12)])
+    t.merge_repeats([0])
+    assert [t.cell(r, 0).row_span for r in (0, 4, 8)] == [4, 4, 4]
+
+def test_merge_errors():
+    with pytest.raises(ValueError):
+        report().merge_repeats(axis=0)
+    with pytest.raises(TypeError):
+        Table.from_iter([(1, 1)]).merge_repeats()
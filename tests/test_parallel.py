@@ -0,0 +1,65 @@
+import pickle
+from copy import deepcopy
+import warnings
+import pytest
+from tabipy import Table, TableHeaderRow, TableCell, TableHeader
+
+def span_table(nrows=60):
+    t = Table(TableHeaderRow('a', 'b', 'c', 'd'),
+              *[(i, i * 0.5, 'r%d' % i, TableHeader(i)) for i in range(nrows)],
+              col_format=('{:d}', '{:.2f}', '{}', '{}'))
+    for r in range(1, nrows, 7):
+        t.cell(r, 1).row_span = 3
+    t.cell(30, 2).col_span = 2
+    return t
+
+def test_chunk_bounds_avoid_row_spans():
+    t = span_table()
+    bounds = t._chunk_bounds(8)
+    assert bounds[0][0] == 0 and bounds[-1][1] == len(t.rows)
+    for (start, stop), (next_start, _) in zip(bounds, bounds[1:]):
+        assert stop == next_start
+        # no row span from the chunk reaches into the next one
+        assert t._grid().above(next_start) == []
+
+def test_pickle_round_trip():
+    t = span_table()
+    copy = pickle.loads(pickle.dumps(t))
+    assert copy._repr_html_() == t._repr_html_()
+    assert copy.rows[1].cells[0]._row is copy.rows[1]
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_parallel_same_as_serial(columnar):
+    warnings.simplefilter('ignore')
+    t = span_table()
+    if columnar:
+        t = Table.from_columns([[r.cells[c].value for r in t.rows[1:]]
+                                for c in range(4)],
+                               header=('a', 'b', 'c', 'd'),
+                               col_format=t.col_format)
+        t.cell(5, 0).row_span = 4
+    assert t.render_html(workers=2) == t._repr_html_()
+    assert t.render_latex(workers=2) == t._repr_latex_()
+    assert (t.render_latex(workers=2, environment='longtable') ==
+            ''.join(t.iter_latex('longtable')))
+
+@pytest.mark.parametrize('columnar', [False, True])
+@pytest.mark.parametrize('how', ['pickle', 'deepcopy'])
+def test_span_change_after_round_trip(columnar, how):
+    if columnar:
+        t = Table.from_columns([[1, 3, 5], [2, 4, 6]], header=('a', 'b'))
+        t.cell(2, 1).value = 4
+    else:
+        t = Table(TableHeaderRow('a', 'b'), (1, 2), (3, 4), (5, 6))
+    if how == 'pickle':
+        copy = pickle.loads(pickle.dumps(t))
+    else:
+        copy = deepcopy(t)
+    copy._repr_html_()
+    copy.cell(1, 0).row_span = 2
+    t.cell(1, 0).row_span = 2
+    assert copy._repr_html_() == t._repr_html_()
+    assert '<tr><td  >4</td></tr>' in copy._repr_html_()
+    copy.cell(2, 1).row_span = 2
+    t.cell(2, 1).row_span = 2
+    assert copy._repr_html_() == t._repr_html_()
@@ -0,0 +1,64 @@
+import tabipy
+from tabipy import Table, TableHeaderRow, TableRow
+
+def table():
+    t = Table(TableHeaderRow('a', 'b'), (1, 2), (3, 4), (5, 6))
+    t.cell(1, 0).row_span = 2
+    return t
+
+def test_profile_phases():
+    with tabipy.profile() as p:
+        t = table()
+        html = t._repr_html_()
+        t._repr_latex_()
+    report = p.report()
+    assert set(report) == set(['construct', 'spans', 'format', 'escape',
+                               'html', 'latex'])
+    assert report['construct']['calls'] == 1
+    assert report['construct']['cells'] == 8
+    assert report['html']['calls'] == 1
+    assert report['format']['calls'] == 15
+    # only the rows a span starts in or reaches into
+    assert report['spans']['calls'] == 2
+    assert report['html']['seconds'] >= report['spans']['seconds']
+    assert str(p).splitlines()[0].split() == ['phase', 'seconds', 'calls',
+                                              'cells', 'cells/s']
+    assert html == table()._repr_html_()
+
+def test_profile_restores_functions():
+    spans, escape = TableRow._spans, tabipy._html_escape
+    from_columns = Table.__dict__['from_columns']
+    with tabipy.profile():
+        assert TableRow._spans is not spans
+        Table.from_columns([[1, 2]])._repr_html_()
+    assert TableRow._spans is spans
+    assert tabipy._html_escape is escape
+    assert Table.__dict__['from_columns'] is from_columns
+
+def test_nested_profiles():
+    with tabipy.profile() as outer:
+        table()
+        with tabipy.profile() as inner:
+            Table.from_columns([[1, 2], [3, 4]])._repr_html_()
+    assert outer.report()['construct']['calls'] == 2
+    # from_columns makes its table with Table(), which is not counted again
+    assert inner.report()['construct']['calls'] == 1
+    assert inner.report()['escape']['cells'] == 4
+    assert 'spans' not in inner.report()
+
+def test_profile_threads():
+    import threading
+    t = Table(*[(i, i * 2) for i in range(2000)])
+    render = lambda: ''.join(t.iter_html())
+    with tabipy.profile() as p:
+        render()
+    calls = p.report()['format']['calls']
+    with tabipy.profile() as p:
+        threads = [threading.Thread(target=render) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    # a phase running in one thread does not hide it in the others
+    assert p.report()['format']['calls'] == 4 * calls
+    assert p.report()['html']['calls'] == 4
@@ -0,0 +1,83 @@
+import io
+import pytest
+from tabipy import Table, TableRow, TableHeaderRow
+
+@pytest.fixture
+def rendered(monkeypatch):
+    "Records the rows rendered to HTML or LaTeX"
+    rows = []
+    html, latex = TableRow._html, TableRow._latex
+    def count_html(self, *args):
+        rows.append(self)
+        return html(self, *args)
+    def count_latex(self, *args):
+        rows.append(self)
+        return latex(self, *args)
+    monkeypatch.setattr(TableRow, '_html', count_html)
+    monkeypatch.setattr(TableRow, '_latex', count_latex)
+    return rows
+
+def table():
+    return Table(TableHeaderRow('a', 'b', 'c'),
+                 *[(i, i + 1, i + 2) for i in range(10)])
+
+def test_unchanged_table_not_rerendered(rendered):
+    t = table()
+    html, latex = t._repr_html_(), t._repr_latex_()
+    assert len(rendered) == 22
+    del rendered[:]
+    assert t._repr_html_() == html
+    assert t._repr_latex_() == latex
+    assert rendered == []
+
+@pytest.mark.parametrize('attr, value', [('value', 'x'), ('format', '{:03d}'),
+                                         ('bg_colour', 'red'),
+                                         ('text_colour', 'blue'),
+                                         ('header', True)])
+def test_cell_change_rerenders_row(rendered, attr, value):
+    t = table()
+    t._repr_html_()
+    del rendered[:]
+    setattr(t.cell(3, 1), attr, value)
+    html = t._repr_html_()
+    assert rendered == [t.rows[3]]
+    assert html == Table(*t.rows)._repr_html_()
+
+def test_span_change_rerenders_neighbours(rendered):
+    t = table()
+    t._repr_html_()
+    del rendered[:]
+    t.cell(3, 1).row_span = 2
+    html = t._repr_html_()
+    # the row below now renders without the covered cell
+    assert rendered == [t.rows[3], t.rows[4]]
+    assert html.count('<td') == 29
+
+def test_col_format_change_rerenders_all(rendered):
+    t = table()
+    t._repr_html_()
+    del rendered[:]
+    t.col_format = ('{:02d}', '{}', '{}')
+    assert '>07<' in t._repr_html_()
+    assert len(rendered) == 11
+
+def test_append_row(rendered):
+    t = table()
+    t._repr_html_()
+    del rendered[:]
+    t.append_row((1, 2, 3))
+    t.rows[1].row_format = ('{}', '{}', '{:.1f}')
+    t._repr_html_()
+    assert rendered == [t.rows[1], t.rows[-1]]
+
+def test_streaming_keeps_no_rows(rendered):
+    t = table()
+    html = ''.join(t.iter_html())
+    t.write_latex(io.StringIO())
+    assert all(row._html_cache is None and row._latex_cache is None
+               for row in t.rows)
+    del rendered[:]
+    # rows kept by a display are still reused when streaming
+    assert t._repr_html_() == html
+    assert ''.join(t.iter_html()) == html
+    assert len(rendered) == 11
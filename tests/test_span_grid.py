@@ -0,0 +1,59 @@
+from tabipy import Table, TableCell
+
+def span_table():
+    t = Table((1, 2, 3),
+              (4, 5, 6),
+              (7, 8, 9))
+    t.cell(0, 0).row_span = 2
+    t.cell(0, 0).col_span = 2
+    return t
+
+def test_owners():
+    t = span_table()
+    owners = t._grid().owners
+    assert owners[0] == [(0, 0), (0, 0), (0, 2)]
+    assert owners[1] == [(0, 0), (0, 0), (1, 2)]
+    # nothing is kept for a row without spans
+    assert owners[2] is None
+    assert t._owners(2) == [(2, 0), (2, 1), (2, 2)]
+
+def test_cell_owner():
+    t = span_table()
+    assert t.cell(1, 1).value == 5
+    assert t.cell(1, 1, owner=True) is t.cell(0, 0)
+    assert t.cell(1, 2, owner=True).value == 6
+
+def test_grid_reused_until_mutation():
+    t = span_table()
+    grid = t._grid()
+    t._repr_html_()
+    t._repr_latex_()
+    assert t._grid() is grid
+    t.cell(2, 1).row_span = 1
+    assert t._grid() is not grid
+    grid = t._grid()
+    t.append_row((1, 2, 3))
+    assert t._grid() is not grid
+    assert t._owners(3) == [(3, 0), (3, 1), (3, 2)]
+
+def test_span_change_rerenders():
+    t = Table((1, 2, 3),
+              (4, 5, 6))
+    assert 'rowspan' not in t._repr_html_()
+    t.cell(0, 0).row_span = 2
+    html = t._repr_html_()
+    assert 'rowspan="2"' in html
+    assert '>4<' not in html
+
+def test_plain_rows_keep_no_spans():
+    t = Table(*[(r, r + 1) for r in range(5)])
+    grid = t._grid()
+    assert grid.spans == [None] * 5 and grid.owners == [None] * 5
+    t.cell(1, 0).row_span = 2
+    grid = t._grid()
+    assert grid.spans[0] is None and grid.spans[3] is None
+    assert grid.spans[1] == [[2, 1], [1, 1]]
+    assert t.cell(2, 0, owner=True) is t.cell(1, 0)
+    t.cell(1, 0).row_span = 1
+    assert t._grid().spans == [None] * 5
+    assert '<td  >3</td>' in t._repr_html_()
@@ -0,0 +1,50 @@
+import io
+import pytest
+from tabipy import Table, TableHeaderRow, TableCell
+
+def span_table():
+    return Table(TableHeaderRow('A', 'B', 'C'),
+                 (TableCell(1, row_span=2), 2, 3),
+                 (4, 5, 6),
+                 (7, TableCell(8, col_span=2), 9),
+                 col_format=('{:d}', '{:d}', '{:d}'))
+
+def test_iter_html_matches_repr():
+    t = span_table()
+    chunks = list(t.iter_html())
+    assert chunks[0] == '<table>\n'
+    assert chunks[-1] == '</table>'
+    # one chunk per row between the opening and closing tags
+    assert len(chunks) == len(t.rows) + 2
+    assert all(c.startswith('<tr>') for c in chunks[1:-1])
+    assert ''.join(chunks) == t._repr_html_()
+
+def test_write_html():
+    t = span_table()
+    fp = io.StringIO()
+    t.write_html(fp)
+    assert fp.getvalue() == t._repr_html_()
+
+def test_iter_latex_matches_repr():
+    t = span_table()
+    chunks = list(t.iter_latex())
+    assert chunks[0].startswith(r'\begin{tabular}')
+    assert chunks[-1] == r'\end{tabular}'
+    assert ''.join(chunks) == t._repr_latex_()
+
+def test_write_latex_longtable():
+    t = span_table()
+    fp = io.StringIO()
+    t.write_latex(fp, environment='longtable')
+    latex = fp.getvalue()
+    lines = latex.split('\n')
+    assert lines[0] == r'\begin{longtable}{*{3}{l}}'
+    assert lines[-1] == r'\end{longtable}'
+    # the header row is repeated after \endfirsthead for following pages
+    assert latex.count(r'\bf A') == 2
+    assert latex.index(r'\endfirsthead') < latex.index(r'\endhead')
+    assert latex.index(r'\endhead') < latex.index('5 & 6')
+
+def test_latex_unknown_environment():
+    with pytest.raises(ValueError):
+        list(Table((1, 2)).iter_latex('tabularx'))
@@ -0,0 +1,100 @@
+import pytest
+from tabipy import Table, TableCell, TableHeaderRow, Style
+import tabipy
+
+@pytest.fixture(params=['numpy', 'python'])
+def backend(request, monkeypatch):
+    "Runs a test with and without NumPy"
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(tabipy, '_numpy', lambda: None)
+    return request.param
+
+def table():
+    return Table(TableHeaderRow('n', 'name'),
+                 *[(i - 2, 'x%d' % i) for i in range(6)])
+
+def classes(html, style):
+    "The rows, counting from 0, with a cell of the given style"
+    rows = html.split('</table>')[0].split('<tr>')[1:]
+    return [r for r, row in enumerate(rows) if style.name in row]
+
+def test_style_where_function(backend):
+    t = table()
+    t.style_where(0, lambda v: v > 0, bg_colour='green')
+    assert classes(t._repr_html_(), Style('green')) == [4, 5, 6]
+
+def test_style_where_scalar_function(backend):
+    t = table()
+    t.style_where(1, lambda v: v.endswith('3'), text_colour='red')
+    assert classes(t._repr_html_(), Style(None, 'red')) == [4]
+
+def test_style_where_mixed_column(backend):
+    t = Table(TableHeaderRow('n', 'name'), (1, 'a'), ('n/a', 'b'), (1, 'c'))
+    t.style_where(0, lambda v: v == 1, bg_colour='green')
+    assert classes(t._repr_html_(), Style('green')) == [1, 3]
+
+def test_style_where_mask_and_layers(backend):
+    t = table()
+    t.style_where(0, [True] * 6, bg_colour='grey')
+    t.style_where(0, [False, True, False, False, False, False],
+                  bg_colour='red')
+    t.style_where(0, [False, False, True, False, False, False])
+    html = t._repr_html_()
+    assert classes(html, Style('grey')) == [1, 4, 5, 6]
+    assert classes(html, Style('red')) == [2]
+    with pytest.raises(ValueError):
+        t.style_where(0, [True])
+
+def test_cell_colour_wins(backend):
+    t = table()
+    t.cell(1, 0).bg_colour = 'blue'
+    t.style_where(0, lambda v: v < 0, bg_colour='green')
+    html = t._repr_html_()
+    assert classes(html, Style('blue')) == [1]
+    assert classes(html, Style('green')) == [2]
+
+def test_rows_appended_after_styling(backend):
+    t = table()
+    t.style_where(0, lambda v: v > 0, bg_colour='green')
+    t.append_row((10, 'y'))
+    assert classes(t._repr_html_(), Style('green')) == [4, 5, 6]
+    t.style_where(0, lambda v: v > 5, bg_colour='green')
+    assert classes(t._repr_html_(), Style('green')) == [4, 5, 6, 7]
+
+def test_gradient(backend):
+    t = Table.from_columns([[0, 5, 10, ''], ['a', 'b', 'c', 'd']],
+                           header=['n', 's'])
+    t.style_gradient(0, low='#000000', high='#ffffff', steps=3)
+    html = t._repr_html_()
+    assert classes(html, Style('#000000')) == [1]
+    assert classes(html, Style('#808080')) == [2]
+    assert classes(html, Style('#ffffff')) == [3]
+    assert 'class=' not in html.split('<tr>')[5].split('</table>')[0]
+
+def test_heatmap_shared_scale(backend):
+    t = Table(*[(i, 10 * i) for i in range(3)])
+    t.heatmap(low='#000', high='#fff', steps=21)
+    html = t._repr_html_()
+    assert classes(html, Style('#000000')) == [0]
+    assert classes(html, Style('#ffffff')) == [2]
+    # 10 is half way between 0 and 20
+    assert classes(html, Style('#808080')) == [1]
+
+def test_columnar_and_clipped(backend):
+    t = Table.from_columns([list(range(100)), list(range(100))],
+                           header=['a', 'b'])
+    t.style_where(1, lambda v: v % 10 == 0, bg_colour='red')
+    html = t._repr_html_()
+    assert len(classes(html, Style('red'))) == 10
+    t.max_rows = 20
+    assert len(classes(t._repr_html_(), Style('red'))) == 2
+    assert Style('red').name in t.render_html().split('</table>')[1]
+
+def test_parallel_chunks_keep_styles(backend):
+    t = table()
+    t.style_where(0, lambda v: v > 0, bg_colour='green')
+    html = ''.join(''.join(tabipy._render_chunk(t._chunk(a, b), 'html')[0])
+                   for a, b in [(0, 3), (3, 7)])
+    assert classes(html.replace('</tr>', ''), Style('green')) == [4, 5, 6]
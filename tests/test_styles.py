@@ -0,0 +1,48 @@
+import pickle
+from tabipy import Table, TableCell, TableHeaderRow, Style
+
+def test_styles_interned():
+    assert Style('red') is Style('red', None)
+    assert Style('red', 'blue') is not Style('red')
+    a, b = TableCell(1, bg_colour='red'), TableCell(2, bg_colour='red')
+    assert a.style is b.style
+    b.text_colour = 'white'
+    assert b.style is Style('red', 'white')
+    assert (b.bg_colour, b.text_colour) == ('red', 'white')
+    assert a.style is Style('red')
+    assert pickle.loads(pickle.dumps(b)).style is b.style
+
+def test_cell_style_argument():
+    cell = TableCell(1, style=Style(text_colour='blue'))
+    assert cell.text_colour == 'blue'
+    assert cell.bg_colour is None
+    assert cell._repr_html_() == '<td  style="color:blue">1</td>'
+
+def test_table_uses_classes():
+    t = Table(TableHeaderRow('a', 'b'), *[(i, i) for i in range(4)])
+    for r in range(1, 5):
+        t.cell(r, 0).bg_colour = 'yellow'
+    t.cell(2, 1).style = Style('red', 'white')
+    html = t._repr_html_()
+    yellow, red = Style('yellow'), Style('red', 'white')
+    assert 'style="' not in html
+    assert html.count('class="%s"' % yellow.name) == 4
+    assert html.count('class="%s"' % red.name) == 1
+    table, style = html.split('</table>\n')
+    assert style == '<style>\n%s\n</style>' % '\n'.join(sorted([
+        '.%s {background-color:red; color:white}' % red.name,
+        '.%s {background-color:yellow}' % yellow.name]))
+    # the styles of rows that were not rendered again are still defined
+    t.cell(1, 1).value = 'x'
+    assert t._repr_html_() == html.replace('<td  >0</td>', '<td  >x</td>', 1)
+
+def test_plain_table_has_no_style_element():
+    assert '<style>' not in Table((1, 2), (3, 4))._repr_html_()
+
+def test_clipped_rows_define_styles():
+    t = Table(*[(i, i) for i in range(20)], max_rows=4)
+    t.cell(19, 1).bg_colour = 'red'
+    t.cell(10, 1).bg_colour = 'blue'
+    html = t._repr_html_()
+    assert Style('red').name in html.split('</table>')[1]
+    assert Style('blue').name not in html
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+import io
+from tabipy import Table, TableCell, TableHeaderRow
+
+def span_table():
+    return Table(TableHeaderRow('A', 'B', 'C', 'D'),
+                 (1.5, TableCell(3.5678, col_span=2), 10.9876),
+                 (112.679, TableCell('long text|x', row_span=2, format='{}'),
+                  23, 7.46036),
+                 (1, 2, 3, 4),
+                 col_format=('{:.2g}', '{:.3g}', '{:d}', '{:.4g}'))
+
+def test_text():
+    assert span_table().to_text() == (
+        'A        B            C   D\n'
+        '-------  -----------  --  -----\n'
+        '1.5      3.57             10.99\n'
+        '1.1e+02  long text|x  23  7.46\n'
+        '1                     3   4\n')
+
+def test_markdown():
+    assert span_table().to_markdown() == (
+        '| A       | B            | C   | D     |\n'
+        '|---------|--------------|-----|-------|\n'
+        '| 1.5     | 3.57         |     | 10.99 |\n'
+        '| 1.1e+02 | long text\\|x | 23  | 7.46  |\n'
+        '| 1       |              | 3   | 4     |\n')
+
+def test_markdown_without_header():
+    assert Table((1, 22), ('a\nb', 3)).to_markdown() == (
+        '|     |     |\n'
+        '|-----|-----|\n'
+        '| 1   | 22  |\n'
+        '| a b | 3   |\n')
+
+def test_wide_spanning_cell_widens_columns():
+    t = Table((TableCell('a long value', col_span=2),), (1, 2))
+    assert t.to_text() == 'a long value\n1  2\n'
+
+class Counted(object):
+    "A value that counts how often it is formatted"
+    calls = 0
+    def __format__(self, spec):
+        Counted.calls += 1
+        return 'c'
+
+def test_values_formatted_once():
+    t = Table(*[(Counted(), Counted()) for i in range(5)])
+    Counted.calls = 0
+    t.to_text()
+    assert Counted.calls == 10
+    Counted.calls = 0
+    t.to_markdown()
+    assert Counted.calls == 10
+
+def test_columnar_and_streamed_match():
+    rows = [(i, i * 0.5, 'r%d' % i) for i in range(30)]
+    expected = Table(TableHeaderRow('a', 'b', 'c'), *rows).to_text()
+    columnar = Table.from_columns(list(zip(*rows)), header=('a', 'b', 'c'))
+    assert columnar.to_text() == expected
+    assert Table.from_iter(rows, header=('a', 'b', 'c')).to_text() == expected
+    out = io.StringIO()
+    Table.from_iter(rows, header=('a', 'b', 'c')).write_text(out)
+    assert out.getvalue() == expected
+
+def test_max_rows_and_pretty():
+    t = Table(*[(i, i * i) for i in range(20)], max_rows=4)
+    text = u'0   0\n1   1\n⋮ 16 rows not shown\n18  324\n19  361\n'
+    assert t.to_text(4) == text
+    class Printer(object):
+        def text(self, text):
+            self.out = text
+    p = Printer()
+    t._repr_pretty_(p, False)
+    assert p.out == text.rstrip('\n')
+
+def test_text_max_rows_clips_spans_like_html():
+    t = Table(TableHeaderRow('a', 'b'), *[(i, i * 10) for i in range(8)])
+    # starts in the rows left out and reaches into the last ones
+    t.cell(4, 0).row_span = 4
+    assert '<tr><td  >3</td><td  >60</td></tr>' in ''.join(t.iter_html(4))
+    assert t.to_text(max_rows=4).splitlines()[-2:] == ['3  60', '7  70']
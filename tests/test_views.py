@@ -0,0 +1,90 @@
+import pytest
+from tabipy import Table, TableCell, TableHeaderRow
+
+def table():
+    t = Table(TableHeaderRow('a', 'b', 'c'),
+              *[(i, 10 - i, 'x%d' % i) for i in range(6)],
+              col_format=('{:02d}', '{}', '{}'))
+    return t
+
+def data_rows(html):
+    return html.split('</tr>')[1:-1]
+
+def test_sort_by():
+    html = table().sort_by(1)._repr_html_()
+    assert html.startswith('<table>\n<tr><th  >a</th>')
+    assert [row.split('</td>')[0][-2:] for row in data_rows(html)] == \
+        ['05', '04', '03', '02', '01', '00']
+    assert '<td  >05</td>' in html
+    html = table().sort_by([2, 0], reverse=True)._repr_html_()
+    assert data_rows(html)[0].endswith('x5</td>')
+
+def test_sort_key_computed_once():
+    calls = []
+    def key(value):
+        calls.append(value)
+        return -value
+    view = table().sort_by(0, key=key)
+    assert len(calls) == 6
+    assert view._repr_html_() == table().sort_by(0, reverse=True)._repr_html_()
+
+def test_filter():
+    view = table().filter(lambda v: v % 2 == 0, col=0)
+    assert len(view) == 3
+    assert len(table().filter(lambda row: row[2] in ('x1', 'x4'))) == 2
+    # the short column is padded, which must not stop the values matching
+    padded = Table({'a': [1, 2, 3], 'b': [1, 2]})
+    assert len(padded.filter(lambda v: v == 1, col=1)) == 1
+
+def test_getitem_rows_and_cols():
+    t = table()
+    view = t[1:3, [2, 0]]
+    assert view._repr_html_() == (
+        '<table>\n'
+        '<tr><th  >c</th><th  >a</th></tr>\n'
+        '<tr><td  >x1</td><td  >01</td></tr>\n'
+        '<tr><td  >x2</td><td  >02</td></tr>\n'
+        '</table>')
+    assert view._repr_latex_() == (
+        '\\begin{tabular}{*{2}{l}}\n\\hline\n'
+        '\\bf c & \\bf a\\\\\\\nhline\n'
+        'x1 & 01\\\\\n'
+        'x2 & 02\\\\\n'
+        '\\hline\n\\end{tabular}')
+    assert len(t[[True, False] * 3]) == 3
+    assert len(t[-1]) == 1
+
+def test_getitem_numpy():
+    np = pytest.importorskip('numpy')
+    t = table()
+    view = t[np.array([True, False, True, False, False, False])]
+    assert view._repr_html_() == t[[0, 2]]._repr_html_()
+    assert t[np.array([0, 2])]._repr_html_() == view._repr_html_()
+    assert len(t[np.int64(1), np.array([2, 0])]) == 1
+
+def test_spans_clipped():
+    t = table()
+    t.cell(2, 0).row_span = 3
+    t.cell(3, 1).col_span = 2
+    html = t[2:4]._repr_html_()
+    assert data_rows(html) == ['\n<tr><td rowspan="2" >01</td>'
+                               '<td colspan="2"  >8</td>',
+                               '\n<tr><td  >7</td><td  >x3</td>']
+    latex = t[2:4, 1:]._repr_latex_()
+    assert '\\multicolumn{2}{l}{8}\\\\\n7 & x3\\\\' in latex
+
+def test_view_latex_matches_table():
+    t = table()
+    t.cell(2, 0).row_span = 2
+    assert t[:]._repr_latex_() == t._repr_latex_()
+
+def test_view_does_not_copy_rows():
+    t = table()
+    view = t.sort_by(0)
+    t.cell(1, 2).value = 'changed'
+    assert 'changed' in view._repr_html_()
+
+def test_columnar_view():
+    t = Table.from_columns([[3, 1, 2], ['c', 'a', 'b']], header=['n', 's'])
+    assert [row[-6:] for row in data_rows(t.sort_by(1)._repr_html_())] == \
+        ['a</td>', 'b</td>', 'c</td>']
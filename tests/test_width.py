@@ -0,0 +1,36 @@
+import pytest
+from tabipy import Table, TableRow, TableCell, TableHeaderRow
+
+def test_width_kept_while_appending(monkeypatch):
+    row = TableRow(1, TableCell(2, col_span=3), 4)
+    monkeypatch.setattr(TableRow, '_count_columns',
+                        lambda self, debug=False: pytest.fail('rescanned'))
+    assert row.column_count() == 5
+    row.append_cell(TableCell(5, col_span=2))
+    assert row.column_count() == 7
+
+def test_width_after_span_change():
+    row = TableRow(1, 2, 3)
+    assert row.column_count() == 3
+    row.cells[2].col_span = 4
+    assert row.column_count() == 6
+    row.cells[2].col_span = 1
+    assert row.column_count() == 3
+
+def test_width_after_cells_changed_directly():
+    row = TableRow(1, 2)
+    row.cells.append(TableCell(3))
+    assert row.column_count() == 3
+
+def test_append_row_checks_width():
+    t = Table(TableHeaderRow('a', 'b', 'c'), (1, 2, 3))
+    assert t.column_count() == 3
+    t.append_row((4, 5))
+    with pytest.raises(ValueError):
+        t.append_row((4, 5, 6, 7))
+    with pytest.raises(ValueError):
+        t.append_row(TableRow(4, TableCell(5, col_span=3)))
+    assert len(t.rows) == 3
+
+def test_empty_table_column_count():
+    assert Table().column_count() == 0
@@ -0,0 +1,57 @@
+import re
+import pytest
+from tabipy import Table, TableRow, TableHeaderRow
+
+def table(**kwargs):
+    return Table(TableHeaderRow('a', 'b', 'c'),
+                 *[(i, i + 1, i + 2) for i in range(10)], **kwargs)
+
+def html_rows(html):
+    return re.findall('<tr>(.*?)</tr>', html)
+
+def test_small_table_unchanged():
+    t = table()
+    assert table(max_rows=10)._repr_html_() == t._repr_html_()
+
+def test_head_and_tail(monkeypatch):
+    t = table(max_rows=4)
+    rendered = []
+    html = TableRow._html
+    def count_html(self, *args):
+        rendered.append(self)
+        return html(self, *args)
+    monkeypatch.setattr(TableRow, '_html', count_html)
+    rows = html_rows(t._repr_html_())
+    assert len(rows) == 1 + 2 + 1 + 2
+    assert '>0<' in rows[1] and '>1<' in rows[2]
+    assert '6 rows not shown' in rows[3]
+    assert 'colspan="3"' in rows[3]
+    assert '>8<' in rows[4] and '>9<' in rows[5]
+    # the elided rows are not rendered at all
+    assert rendered == []
+
+def test_row_span_clipped_at_window_edges():
+    t = table(max_rows=4)
+    # spans from the head into the elided rows
+    t.cell(2, 0).row_span = 3
+    # spans from the elided rows into the tail
+    t.cell(7, 2).row_span = 4
+    rows = html_rows(t._repr_html_())
+    assert 'rowspan' not in rows[2]
+    assert rows[2].count('<td') == 3
+    assert 'rowspan="2"' in rows[4]
+    assert '>8<' in rows[4]
+    assert rows[5].count('<td') == 2
+
+def test_page():
+    t = table()
+    t.cell(2, 0).row_span = 5
+    rows = html_rows(t.page(1, 3)._repr_html_())
+    assert len(rows) == 1 + 3 + 1
+    assert '>a<' in rows[0]
+    # the cell from row 2 is shown at the top of the page
+    assert 'rowspan="3"' in rows[1] and '>1<' in rows[1]
+    assert 'rows 4' in rows[4] and 'of 10' in rows[4]
+    assert 'no rows' in t.page(5, 3)._repr_html_()
+    with pytest.raises(ValueError):
+        t.page(0, 0)